@@ -1,16 +1,58 @@
-from PySide6.QtWidgets import QApplication
+import time
+BOOT_START = time.perf_counter()
+
 import sys
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
+#the audit has to be installed before anything heavy is imported
+from system.core.lazy_import import ImportAudit
+if "-auditimports" in sys.argv:
+    ImportAudit.start()
+
+from PySide6.QtWidgets import QApplication
+
+from system.core.boot_profiler import BootProfiler
+BootProfiler.init(BOOT_START)
+
 from system.core.system import LSystem013 
 from system.core.flags import SystemFlags
 
+BootProfiler.record("imports", 0.0, BootProfiler.now_ms())
+
+def get_arg_value(name, default=None):
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
 if __name__ == "__main__":
     flags = SystemFlags.NONE
     
+    #the parent process only spawns the iterations and aggregates their results
+    if "-benchmark" in sys.argv:
+        from system.core.benchmark import run_benchmark, format_benchmark, DEFAULT_BENCHMARK_USER, DEFAULT_BENCHMARK_PASSWORD
+        from system.core.constants import SYSTEM_APP_ID
+        
+        iterations = get_arg_value("-benchmark", "5")
+        iterations = int(iterations) if iterations.isdigit() else 5
+        print(f"'-benchmark' argument | Medir o fluxo completo {iterations} vezes")
+        passthrough = [arg for arg in ("-skipsplash", "-skiplogin") if arg in sys.argv]
+        report, base_path = run_benchmark(
+            iterations,
+            os.path.abspath(__file__),
+            get_arg_value("-benchuser", DEFAULT_BENCHMARK_USER),
+            get_arg_value("-benchpassword", DEFAULT_BENCHMARK_PASSWORD),
+            get_arg_value("-benchapp", SYSTEM_APP_ID),
+            passthrough
+        )
+        print(format_benchmark(report))
+        print(f"Benchmark written to: {base_path}.txt/.json")
+        sys.exit(1 if report["failures"] else 0)
+    
     if len(sys.argv) > 1:
         if "-fullscreen" in sys.argv:
             flags |= SystemFlags.WINDOW_FULLSCREEN
@@ -27,9 +69,37 @@ if __name__ == "__main__":
         if "-skiplogin" in sys.argv:
             flags |= SystemFlags.SKIP_LOGIN_SCREEN
             print("'-skiplogin' argument | Pular tela de login")
+        
+        if "-profileboot" in sys.argv:
+            flags |= SystemFlags.PROFILE_BOOT
+            print("'-profileboot' argument | Gerar relatório de tempo de boot")
+        
+        if "-auditimports" in sys.argv:
+            flags |= SystemFlags.AUDIT_IMPORTS
+            print("'-auditimports' argument | Listar os imports mais lentos")
+        
+        if "-noprewarm" in sys.argv:
+            flags |= SystemFlags.NO_PREWARM
+            print("'-noprewarm' argument | Não pré-carregar os apps mais usados")
+        
+        if "-nousagestats" in sys.argv:
+            flags |= SystemFlags.NO_USAGE_STATS
+            print("'-nousagestats' argument | Não registrar as aberturas de apps")
     else:
         print("Nenhum argumento extra foi passado")
 
-    app = QApplication(sys.argv)
+    with BootProfiler.phase("qapplication"):
+        app = QApplication(sys.argv)
     ls013 = LSystem013(flags)
+    
+    if "-benchmarkrun" in sys.argv:
+        from system.core.benchmark import BenchmarkDriver, DEFAULT_BENCHMARK_USER, DEFAULT_BENCHMARK_PASSWORD
+        from system.core.constants import SYSTEM_APP_ID
+        
+        benchmark = BenchmarkDriver(
+            ls013,
+            get_arg_value("-benchuser", DEFAULT_BENCHMARK_USER),
+            get_arg_value("-benchpassword", DEFAULT_BENCHMARK_PASSWORD),
+            get_arg_value("-benchapp", SYSTEM_APP_ID)
+        )
     app.exec()
\ No newline at end of file
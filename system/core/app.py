@@ -33,6 +33,8 @@ class AppManifest:
     dependencies: List[str] = field(default_factory=list)
     author: Optional[str] = None
     license: Optional[str] = None
+    #run in a separate process with its own QApplication
+    isolated: bool = False
 
     def __post_init__(self):
         if not re.match(r"^[a-z_][a-z0-9_]*(\.[a-z_][a-z0-9_]*)*$", self.package):
@@ -55,7 +57,8 @@ class AppManifest:
             "main_class": self.main_class,
             "dependencies": self.dependencies,
             "author": self.author,
-            "license": self.license
+            "license": self.license,
+            "isolated": self.isolated
         }
 
     @classmethod
@@ -75,17 +78,20 @@ class AppManifest:
             app_id=data.get("id", str(uuid.uuid4())),
             dependencies=data.get("dependencies", []),
             author=data.get("author"),
-            license=data.get("license")
+            license=data.get("license"),
+            isolated=data.get("isolated", False)
         )
 
 class App:
-    def __init__(self, manifest: AppManifest, icon_path: Optional[str] = None):
+    def __init__(self, manifest: AppManifest, icon_path: Optional[str] = None, bundle_path: Optional[str] = None):
         if not isinstance(manifest, AppManifest):
             raise TypeError("manifest must be an AppManifest instance")
         
         self.manifest = manifest
         self._stored_icon_path = icon_path
         self._resolved_icon_path = None
+        #installed archive of apps that came from a bundle (relative to the root, like icon_path)
+        self.bundle_path = bundle_path
         
         self.app_id = manifest.app_id
         self.name = manifest.name
@@ -116,10 +122,12 @@ class App:
     def to_dict(self) -> Dict[str, Any]:
         data = self.manifest.to_dict()
         data["icon_path"] = self._stored_icon_path
+        if self.bundle_path:
+            data["bundle_path"] = self.bundle_path
         return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "App":
         manifest = AppManifest.from_dict(data)
         icon_path = data.get("icon_path")
-        return cls(manifest, icon_path=icon_path)
\ No newline at end of file
+        return cls(manifest, icon_path=icon_path, bundle_path=data.get("bundle_path"))
\ No newline at end of file
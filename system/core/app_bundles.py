@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import compileall
+import py_compile
+import importlib.util
+from io import StringIO
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from system.core.constants import *
+from system.core.log import *
+from system.core.app import App, AppManifest
+from system.core.apps_manager import AppsManager
+
+class BundleError(Exception):
+    pass
+
+def _safe_member(name: str) -> bool:
+    normalized = os.path.normpath(name)
+    return not (os.path.isabs(name) or normalized.startswith("..") or ":" in normalized)
+
+def _package_files(package: str) -> Tuple[str, str]:
+    path = package.replace(".", "/")
+    return f"{path}.py", f"{path}/__init__.py"
+
+def read_bundle_manifest(archive: str) -> Dict:
+    """Lê e valida o manifest.json de um pacote de app (zip com o manifesto, o código e o ícone)."""
+    try:
+        with zipfile.ZipFile(archive) as bundle:
+            names = set(bundle.namelist())
+            unsafe = [name for name in names if not _safe_member(name)]
+            if unsafe:
+                raise BundleError(f"Unsafe path in bundle: {unsafe[0]}")
+            if APP_BUNDLE_MANIFEST_FILENAME not in names:
+                raise BundleError(f"Bundle has no {APP_BUNDLE_MANIFEST_FILENAME}")
+            data = json.loads(bundle.read(APP_BUNDLE_MANIFEST_FILENAME).decode("utf-8"))
+    except (OSError, zipfile.BadZipFile) as e:
+        raise BundleError(f"Could not open bundle: {e}")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise BundleError(f"Invalid {APP_BUNDLE_MANIFEST_FILENAME}: {e}")
+
+    if "id" not in data:
+        raise BundleError("Bundle manifest has no id")
+    try:
+        manifest = AppManifest.from_dict(data)
+    except (KeyError, TypeError, ValueError) as e:
+        raise BundleError(f"Invalid bundle manifest: {e}")
+
+    if not any(path in names for path in _package_files(manifest.package)):
+        raise BundleError(f"Bundle does not contain package {manifest.package}")
+    icon = data.get("icon")
+    if icon and icon not in names:
+        raise BundleError(f"Bundle does not contain icon {icon}")
+    return data
+
+def bundle_root(manifest: AppManifest) -> str:
+    """Pasta do cache onde o pacote fica extraído e compilado; entra no sys.path enquanto o app está instalado."""
+    return os.path.join(APP_BUNDLES_CACHE_PATH, f"{manifest.app_id}-{manifest.version}")
+
+def stored_bundle_path(manifest: AppManifest) -> str:
+    return os.path.join(APP_BUNDLES_PATH, f"{manifest.app_id}.zip")
+
+def _extract_and_compile(job: Tuple[str, str]) -> float:
+    #runs in worker processes, so it has to be a picklable module-level function
+    archive, destination = job
+    start = time.perf_counter()
+    staging = f"{destination}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    with zipfile.ZipFile(archive) as bundle:
+        bundle.extractall(staging)
+    #the extracted tree is never edited, only rebuilt from the archive, so imports can skip the source check
+    output = StringIO()
+    with redirect_stdout(output):
+        compiled = compileall.compile_dir(staging, quiet=1, invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    if not compiled:
+        shutil.rmtree(staging, ignore_errors=True)
+        errors = [line.strip() for line in output.getvalue().splitlines() if line.strip()]
+        raise BundleError(f"Bundle source does not compile: {errors[-1] if errors else 'unknown error'}")
+
+    shutil.rmtree(destination, ignore_errors=True)
+    os.replace(staging, destination)
+    return time.perf_counter() - start
+
+def _install_job(job: Tuple[str, str, str]) -> float:
+    archive, stored_archive, destination = job
+    os.makedirs(os.path.dirname(stored_archive), exist_ok=True)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.abspath(archive) != os.path.abspath(stored_archive):
+        shutil.copyfile(archive, stored_archive)
+    return _extract_and_compile((stored_archive, destination))
+
+def mount_bundle(manifest: AppManifest, bundle_path: str) -> str:
+    """Garante que o pacote instalado está extraído no cache (refaz a extração se o cache foi apagado)
+    e coloca a pasta no sys.path. Retorna a pasta."""
+    root = bundle_root(manifest)
+    if not os.path.isdir(root):
+        LOG_INFO("Extracting bundle of {} to the apps cache", manifest.name)
+        os.makedirs(APP_BUNDLES_CACHE_PATH, exist_ok=True)
+        _extract_and_compile((os.path.join(ROOT_PATH, bundle_path), root))
+    if root not in sys.path:
+        sys.path.append(root)
+    return root
+
+def unmount_bundle(manifest: AppManifest) -> None:
+    root = bundle_root(manifest)
+    if root in sys.path:
+        sys.path.remove(root)
+    #forget the modules so a later install of the same package imports the new code
+    top_level = manifest.package.split(".")[0]
+    for name in [name for name in sys.modules if name == top_level or name.startswith(top_level + ".")]:
+        del sys.modules[name]
+
+@dataclass
+class InstallReport:
+    installed: List[str] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    prepare_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def __str__(self):
+        return (f"{len(self.installed)} apps installed, {len(self.failures)} failed in {self.total_seconds:.2f} s "
+                f"(extract and compile {self.prepare_seconds:.2f} s)")
+
+def install_bundles(archives: List[str], max_workers: Optional[int] = None) -> InstallReport:
+    """Instala vários pacotes de app: extração e compilação para bytecode em paralelo, em processos,
+    e um único registro no AppsManager para todos os que deram certo."""
+    report = InstallReport()
+    start = time.perf_counter()
+    manager = AppsManager()
+
+    accepted = []
+    seen_ids, seen_packages = set(), set()
+    for archive in archives:
+        try:
+            data = read_bundle_manifest(archive)
+            manifest = AppManifest.from_dict(data)
+        except BundleError as e:
+            report.failures.append((archive, str(e)))
+            continue
+
+        top_level = manifest.package.split(".")[0]
+        if manifest.app_id in seen_ids or manifest.app_id in manager.apps_by_id:
+            report.failures.append((archive, f"app {manifest.app_id} is already installed"))
+            continue
+        if top_level in seen_packages or importlib.util.find_spec(top_level) is not None:
+            report.failures.append((archive, f"package {top_level} is already in use"))
+            continue
+
+        seen_ids.add(manifest.app_id)
+        seen_packages.add(top_level)
+        accepted.append((archive, data, manifest))
+
+    prepared = []
+    if accepted:
+        prepare_start = time.perf_counter()
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(accepted))) as executor:
+            futures = [(archive, data, manifest,
+                        executor.submit(_install_job, (archive, stored_bundle_path(manifest), bundle_root(manifest))))
+                       for archive, data, manifest in accepted]
+            for archive, data, manifest, future in futures:
+                try:
+                    future.result()
+                    prepared.append((archive, data, manifest))
+                except Exception as e:
+                    report.failures.append((archive, str(e)))
+                    _remove_files(manifest)
+        report.prepare_seconds = time.perf_counter() - prepare_start
+
+    apps = []
+    for archive, data, manifest in prepared:
+        icon = data.get("icon")
+        icon_path = os.path.relpath(os.path.join(bundle_root(manifest), icon), ROOT_PATH) if icon else None
+        apps.append(App(manifest, icon_path=icon_path, bundle_path=os.path.relpath(stored_bundle_path(manifest), ROOT_PATH)))
+
+    if apps:
+        try:
+            with manager.transaction() as txn:
+                for app in apps:
+                    txn.register(app)
+        except (OSError, ValueError) as e:
+            for (archive, _, manifest), app in zip(prepared, apps):
+                report.failures.append((archive, f"registration failed: {e}"))
+                _remove_files(manifest)
+        else:
+            for app in apps:
+                mount_bundle(app.manifest, app.bundle_path)
+                report.installed.append(app.name)
+
+    report.total_seconds = time.perf_counter() - start
+    LOG_INFO("App bundles: {}", report)
+    return report
+
+def install_bundle(archive: str) -> App:
+    report = install_bundles([archive], max_workers=1)
+    if report.failures:
+        raise BundleError(report.failures[0][1])
+    manifest = AppManifest.from_dict(read_bundle_manifest(archive))
+    return AppsManager().get_app(manifest.app_id)
+
+def _remove_files(manifest: AppManifest) -> None:
+    shutil.rmtree(bundle_root(manifest), ignore_errors=True)
+    try:
+        os.remove(stored_bundle_path(manifest))
+    except OSError:
+        pass
+
+def uninstall_bundle(app_id: str) -> None:
+    manager = AppsManager()
+    app = manager.get_app(app_id)
+    if not app.bundle_path:
+        raise BundleError(f"{app.name} was not installed from a bundle")
+
+    manager.remove_app(app_id)
+    unmount_bundle(app.manifest)
+    _remove_files(app.manifest)
+    LOG_INFO("Uninstalled bundle of {}", app.name)
\ No newline at end of file
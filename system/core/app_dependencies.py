@@ -0,0 +1,185 @@
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Set
+
+from PySide6.QtCore import QObject, Signal
+
+from system.core.log import *
+from system.core.apps_manager import AppsManager
+
+class DependencyError(Exception):
+    pass
+
+class MissingDependencyError(DependencyError):
+    pass
+
+class DependencyCycleError(DependencyError):
+    pass
+
+class DependencyResolver:
+    """Monta o grafo de dependências dos apps. Uma dependência pode ser o id ou o pacote de outro app
+    (cujas dependências entram no grafo) ou o nome de qualquer módulo Python importável."""
+
+    def __init__(self, manager: Optional[AppsManager] = None):
+        self.manager = manager or AppsManager()
+
+    def _resolve_name(self, dependency: str) -> str:
+        app = self.manager.apps_by_id.get(dependency) or self.manager.apps_by_package.get(dependency)
+        return app.manifest.package if app is not None else dependency
+
+    def _direct_dependencies(self, package: str) -> List[str]:
+        app = self.manager.apps_by_package.get(package)
+        if app is None:
+            return []
+        return [self._resolve_name(dependency) for dependency in app.manifest.dependencies]
+
+    @staticmethod
+    def _exists(module_name: str) -> bool:
+        if module_name in sys.modules:
+            return True
+        try:
+            return importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def graph(self, app: 'App') -> Dict[str, Set[str]]:
+        """Retorna {módulo: módulos dos quais depende}, incluindo o próprio app. Levanta erro em ciclos ou módulos ausentes."""
+        graph: Dict[str, Set[str]] = {}
+        visiting: List[str] = []
+
+        def visit(package):
+            if package in graph:
+                return
+            if package in visiting:
+                cycle = visiting[visiting.index(package):] + [package]
+                raise DependencyCycleError(f"Dependency cycle: {' -> '.join(cycle)}")
+            if not self._exists(package):
+                required_by = visiting[-1] if visiting else app.manifest.package
+                raise MissingDependencyError(f"Missing dependency '{package}' required by '{required_by}'")
+
+            visiting.append(package)
+            dependencies = self._direct_dependencies(package)
+            for dependency in dependencies:
+                visit(dependency)
+            visiting.pop()
+            graph[package] = set(dependencies)
+
+        visit(app.manifest.package)
+        return graph
+
+    def load_order(self, app: 'App') -> List[str]:
+        """Ordem topológica: cada módulo aparece depois de todas as suas dependências."""
+        #graph() adds a module only after its dependencies, so insertion order is already topological
+        return list(self.graph(app))
+
+    def validate(self) -> Dict[str, str]:
+        """Verifica todos os apps registrados; retorna {app_id: problema}."""
+        problems = {}
+        for app in self.manager.apps:
+            try:
+                self.graph(app)
+            except DependencyError as e:
+                problems[app.app_id] = str(e)
+        return problems
+
+class AppPreloader(QObject):
+    """Importa em segundo plano os módulos de um app e de suas dependências, respeitando a ordem do grafo;
+    ramos independentes são importados em paralelo. Depois disso a abertura só precisa construir a janela."""
+    preloaded = Signal(str, float)
+    failed = Signal(str, str)
+
+    MAX_WORKERS = 4
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AppPreloader, cls).__new__(cls)
+            cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        super().__init__()
+        self.__initialized = True
+
+        self.executor = ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, os.cpu_count() or 1),
+                                           thread_name_prefix="app-preload")
+        self.lock = threading.Lock()
+        self.loaded: Set[str] = set()
+        self.pending: Set[str] = set()
+        #apps whose graph or imports failed; they are not retried (nor logged again) until restart
+        self.failed_apps: Set[str] = set()
+
+    def preload(self, app: 'App') -> bool:
+        if app.manifest.isolated:
+            #isolated apps import their modules in their own process
+            return False
+
+        with self.lock:
+            if app.app_id in self.pending or app.app_id in self.failed_apps or app.manifest.package in self.loaded:
+                return False
+            self.pending.add(app.app_id)
+
+        try:
+            graph = DependencyResolver().graph(app)
+        except DependencyError as e:
+            with self.lock:
+                self.pending.discard(app.app_id)
+                self.failed_apps.add(app.app_id)
+            LOG_ERROR("Cannot preload {}: {}", app.name, e)
+            self.failed.emit(app.app_id, str(e))
+            return False
+
+        threading.Thread(target=self._run, args=(app, graph), name=f"app-preload-{app.name}", daemon=True).start()
+        return True
+
+    def preload_all(self, apps: List['App']) -> None:
+        for app in apps:
+            self.preload(app)
+
+    def _import(self, module_name: str) -> None:
+        if module_name not in sys.modules:
+            importlib.import_module(module_name)
+        with self.lock:
+            self.loaded.add(module_name)
+
+    def _run(self, app: 'App', graph: Dict[str, Set[str]]) -> None:
+        start = time.perf_counter()
+        remaining = {module: set(deps) for module, deps in graph.items()}
+        running = {}
+        error = None
+
+        #same scheduling as the boot pipeline: submit every module whose dependencies are already imported
+        while (remaining or running) and error is None:
+            for module in [m for m, deps in remaining.items() if not deps]:
+                del remaining[module]
+                running[self.executor.submit(self._import, module)] = module
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                module = running.pop(future)
+                if future.exception() is not None:
+                    error = f"Failed to import {module}: {future.exception()}"
+                    break
+                for deps in remaining.values():
+                    deps.discard(module)
+
+        with self.lock:
+            self.pending.discard(app.app_id)
+            if error is not None:
+                self.failed_apps.add(app.app_id)
+
+        if error is not None:
+            LOG_ERROR("Preload of {} failed: {}", app.name, error)
+            self.failed.emit(app.app_id, error)
+        else:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            LOG_INFO("Preloaded {} ({} modules) in {:.1f} ms", app.name, len(graph), elapsed_ms)
+            self.preloaded.emit(app.app_id, elapsed_ms)
\ No newline at end of file
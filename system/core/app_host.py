@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import argparse
+import importlib
+
+from PySide6.QtCore import QObject, QEvent
+from PySide6.QtNetwork import QLocalSocket
+from PySide6.QtWidgets import QApplication
+
+from system.core.log import *
+from system.core.app_ipc import encode_message, MessageReader
+
+class _IpcLogSink:
+    """Manda os logs do processo isolado para o shell; guarda o que vier antes da conexão."""
+
+    def __init__(self):
+        self.host = None
+        self.pending = []
+
+    def __call__(self, message):
+        record = message.record
+        entry = {"type": "log", "level": record["level"].name, "message": record["message"]}
+        if self.host is None:
+            self.pending.append(entry)
+        else:
+            self.host.send(entry)
+
+    def attach(self, host):
+        self.host = host
+        for entry in self.pending:
+            host.send(entry)
+        self.pending = []
+
+class AppHost(QObject):
+    """Lado do processo isolado: hospeda a janela de um app e responde aos comandos do shell."""
+
+    def __init__(self, window, server_name, instance_id, timings=None):
+        super().__init__()
+        self.window = window
+        self.instance_id = instance_id
+        self.started_at = time.perf_counter()
+        self.painted = False
+        self.reader = MessageReader()
+
+        self.socket = QLocalSocket(self)
+        self.socket.readyRead.connect(self._on_ready_read)
+        #without the shell there is nobody to show the window to
+        self.socket.disconnected.connect(QApplication.quit)
+        self.socket.connectToServer(server_name)
+        if not self.socket.waitForConnected(3000):
+            raise RuntimeError(f"Could not connect to shell: {self.socket.errorString()}")
+
+        window.installEventFilter(self)
+        self.send(dict(timings or {}, type="hello", pid=os.getpid()))
+
+    def send(self, message):
+        message["instance"] = self.instance_id
+        self.socket.write(encode_message(message))
+        self.socket.flush()
+
+    def eventFilter(self, watched, event):
+        if watched is self.window and event.type() == QEvent.Paint and not self.painted:
+            #the shell times the first paint against when it started the process
+            self.painted = True
+            self.send({"type": "painted"})
+        elif watched is self.window and event.type() == QEvent.Close:
+            self.send({"type": "closed"})
+            self.socket.waitForBytesWritten(1000)
+        return False
+
+    def _on_ready_read(self):
+        for message in self.reader.feed(bytes(self.socket.readAll())):
+            kind = message.get("type")
+            if kind == "close":
+                self.window.close()
+                QApplication.quit()
+            elif kind == "health":
+                self.send({
+                    "type": "health",
+                    "pid": os.getpid(),
+                    "uptime_s": round(time.perf_counter() - self.started_at, 2),
+                    "visible": self.window.isVisible()
+                })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hosts an LS013 app in its own process")
+    parser.add_argument("--package", required=True)
+    parser.add_argument("--main-class", required=True)
+    parser.add_argument("--server", required=True)
+    parser.add_argument("--instance", required=True)
+    parser.add_argument("--path", default=None, help="extracted bundle to import the app from")
+    args = parser.parse_args(argv)
+
+    if args.path and args.path not in sys.path:
+        sys.path.append(args.path)
+
+    app = QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(True)
+    #the shell writes what the app logs to its own file, so the app process does not open one
+    sink = _IpcLogSink()
+    Log.init_sink(sink)
+
+    start = time.perf_counter()
+    module = importlib.import_module(args.package)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if hasattr(module, "create_app_instance"):
+        window = module.create_app_instance(parent=None)
+    else:
+        window = getattr(module, args.main_class)(parent=None)
+    construct_ms = (time.perf_counter() - start) * 1000
+
+    window.show()
+    host = AppHost(window, args.server, args.instance, {"import_ms": round(import_ms, 2), "construct_ms": round(construct_ms, 2)})
+    sink.attach(host)
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtWidgets import QApplication
+
+from system.core.constants import *
+from system.core.log import *
+from system.core.apps_manager import AppsManager
+from system.core.app_metrics import AppInstanceMetrics, AppMetricsSampler
+from system.core.app_bundles import bundle_root
+
+#the control channel speaks JSON lines: one message (a dict with a "type") per line
+def encode_message(message: Dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+class MessageReader:
+    """Junta os bytes que chegam do socket e devolve as mensagens completas."""
+
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data: bytes) -> List[Dict]:
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+
+        messages = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                messages.append(json.loads(line))
+            except json.JSONDecodeError:
+                LOG_WARN("Ignoring malformed app IPC message: {}", line[:200])
+        return messages
+
+@dataclass
+class IsolatedAppInstance:
+    instance_id: str
+    app: 'App'
+    process: QProcess
+    socket: Optional[QLocalSocket] = None
+    reader: MessageReader = field(default_factory=MessageReader)
+    pid: Optional[int] = None
+    started_at: float = field(default_factory=time.perf_counter)
+    last_health: Optional[Dict] = None
+    last_seen: float = field(default_factory=time.perf_counter)
+    unresponsive: bool = False
+
+class IsolatedAppsManager(QObject):
+    """Roda apps marcados como isolated em processos próprios e conversa com eles por um QLocalServer."""
+    launched = Signal(str, float)
+    health_reported = Signal(str, dict)
+    unresponsive = Signal(str)
+    closed = Signal(str, int)
+
+    HEALTH_INTERVAL = 5000
+    HEALTH_TIMEOUT = 15000
+    CLOSE_TIMEOUT = 3000
+    #what the app process logged, by loguru level name
+    LOG_LEVELS = {"DEBUG": LOG_TRACE, "INFO": LOG_INFO, "WARNING": LOG_WARN, "ERROR": LOG_ERROR, "CRITICAL": LOG_FATAL}
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IsolatedAppsManager, cls).__new__(cls)
+            cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        super().__init__()
+        self.__initialized = True
+
+        self.instances: Dict[str, IsolatedAppInstance] = {}
+        self.server_name = f"ls013-apps-{os.getpid()}"
+
+        self.server = QLocalServer(self)
+        QLocalServer.removeServer(self.server_name)
+        if not self.server.listen(self.server_name):
+            LOG_ERROR("Could not start isolated apps server: {}", self.server.errorString())
+        self.server.newConnection.connect(self._on_new_connection)
+
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self._check_health)
+        self.health_timer.start(self.HEALTH_INTERVAL)
+
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    def launch(self, app: 'App') -> str:
+        instance_id = uuid.uuid4().hex
+        process = QProcess(self)
+        process.setWorkingDirectory(ROOT_PATH)
+        process.setProcessChannelMode(QProcess.ForwardedChannels)
+        process.finished.connect(lambda code, status, instance_id=instance_id: self._on_process_finished(instance_id, code))
+
+        instance = IsolatedAppInstance(instance_id, app, process)
+        self.instances[instance_id] = instance
+        AppsManager().track_instance(AppInstanceMetrics(instance_id, app.app_id, app.name, isolated=True))
+
+        arguments = [
+            "-m", "system.core.app_host",
+            "--package", app.manifest.package,
+            "--main-class", app.manifest.main_class,
+            "--server", self.server_name,
+            "--instance", instance_id
+        ]
+        if app.bundle_path:
+            arguments += ["--path", bundle_root(app.manifest)]
+        process.start(sys.executable, arguments)
+        LOG_INFO("Launching isolated app {} ({})", app.name, instance_id)
+        return instance_id
+
+    def send(self, instance_id: str, message: Dict) -> bool:
+        instance = self.instances.get(instance_id)
+        if instance is None or instance.socket is None:
+            return False
+        instance.socket.write(encode_message(message))
+        instance.socket.flush()
+        return True
+
+    def request_health(self, instance_id: str) -> bool:
+        return self.send(instance_id, {"type": "health"})
+
+    def close(self, instance_id: str) -> None:
+        instance = self.instances.get(instance_id)
+        if instance is None:
+            return
+        if not self.send(instance_id, {"type": "close"}):
+            instance.process.terminate()
+        #an app that ignores the request is killed
+        QTimer.singleShot(self.CLOSE_TIMEOUT, lambda: self._kill(instance_id))
+
+    def instances_of(self, app_id: str) -> List[IsolatedAppInstance]:
+        return [instance for instance in self.instances.values() if instance.app.app_id == app_id]
+
+    def shutdown(self) -> None:
+        for instance in list(self.instances.values()):
+            self.send(instance.instance_id, {"type": "close"})
+        for instance in list(self.instances.values()):
+            if not instance.process.waitForFinished(self.CLOSE_TIMEOUT):
+                instance.process.kill()
+        self.server.close()
+
+    def _kill(self, instance_id: str) -> None:
+        instance = self.instances.get(instance_id)
+        if instance is not None and instance.process.state() != QProcess.NotRunning:
+            LOG_WARN("Isolated app {} did not close in time, killing it", instance.app.name)
+            instance.process.kill()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            reader = MessageReader()
+            #the first message names the instance; until then the socket is not bound to one
+            socket.readyRead.connect(lambda socket=socket, reader=reader: self._on_ready_read(socket, reader))
+
+    def _on_ready_read(self, socket, reader):
+        for message in reader.feed(bytes(socket.readAll())):
+            instance = self.instances.get(message.get("instance"))
+            if instance is None:
+                LOG_WARN("App IPC message from unknown instance: {}", message.get("instance"))
+                continue
+            self._handle_message(instance, socket, message)
+
+    def _handle_message(self, instance: IsolatedAppInstance, socket, message: Dict):
+        instance.last_seen = time.perf_counter()
+        instance.unresponsive = False
+        kind = message.get("type")
+
+        if kind == "hello":
+            instance.socket = socket
+            instance.pid = message.get("pid")
+            elapsed_ms = (time.perf_counter() - instance.started_at) * 1000
+            LOG_INFO("Isolated app {} ready in {:.1f} ms (pid {})", instance.app.name, elapsed_ms, instance.pid)
+            
+            metrics = AppsManager().get_instance(instance.instance_id)
+            if metrics is not None:
+                metrics.pid = instance.pid
+                metrics.import_ms = message.get("import_ms")
+                metrics.construct_ms = message.get("construct_ms")
+                AppMetricsSampler().watch(metrics)
+            self.launched.emit(instance.instance_id, elapsed_ms)
+        elif kind == "painted":
+            metrics = AppsManager().get_instance(instance.instance_id)
+            if metrics is not None:
+                metrics.first_paint_ms = (time.perf_counter() - instance.started_at) * 1000
+                LOG_INFO("Isolated app {} first paint in {:.1f} ms", instance.app.name, metrics.first_paint_ms)
+        elif kind == "health":
+            instance.last_health = message
+            self.health_reported.emit(instance.instance_id, message)
+        elif kind == "log":
+            log = self.LOG_LEVELS.get(message.get("level"), LOG_INFO)
+            log("[{}] {}", instance.app.name, message.get("message", ""))
+        elif kind == "closed":
+            LOG_INFO("Isolated app {} closed its window", instance.app.name)
+
+    def _check_health(self):
+        now = time.perf_counter()
+        for instance in self.instances.values():
+            if instance.socket is None:
+                continue
+            if not instance.unresponsive and (now - instance.last_seen) * 1000 > self.HEALTH_TIMEOUT:
+                instance.unresponsive = True
+                LOG_WARN("Isolated app {} is not responding", instance.app.name)
+                self.unresponsive.emit(instance.instance_id)
+            self.request_health(instance.instance_id)
+
+    def _on_process_finished(self, instance_id: str, exit_code: int):
+        instance = self.instances.pop(instance_id, None)
+        if instance is None:
+            return
+        if instance.socket is not None:
+            instance.socket.deleteLater()
+        instance.process.deleteLater()
+        AppMetricsSampler().sample()
+        AppMetricsSampler().unwatch(instance_id)
+        AppsManager().finish_instance(instance_id)
+
+        if exit_code != 0:
+            LOG_ERROR("Isolated app {} exited with code {}", instance.app.name, exit_code)
+        else:
+            LOG_INFO("Isolated app {} exited", instance.app.name)
+        self.closed.emit(instance_id, exit_code)
\ No newline at end of file
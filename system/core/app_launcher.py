@@ -1,33 +1,224 @@
 import importlib
+import importlib.util
+import os
 import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from types import ModuleType
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QEvent, QTimer, Qt
+from PySide6.QtWidgets import QMainWindow
+
+from system.core.log import *
+from system.core.lazy_import import lazy_import
+from system.core.app_metrics import AppInstanceMetrics, process_usage
+
+IsolatedAppsManager = lazy_import("system.core.app_ipc", "IsolatedAppsManager")
+AppsManager = lazy_import("system.core.apps_manager", "AppsManager")
+
+@dataclass
+class LaunchTimings:
+    package: str
+    module_cached: bool
+    import_ms: float = 0.0
+    construct_ms: float = 0.0
+    show_ms: float = 0.0
+    first_paint_ms: Optional[float] = None
+    prewarmed: bool = False
+
+    def __str__(self):
+        first_paint = f"{self.first_paint_ms:.1f} ms" if self.first_paint_ms is not None else "n/a"
+        source = "prewarmed" if self.prewarmed else "cached" if self.module_cached else "loaded"
+        return (f"{self.package}: import {self.import_ms:.1f} ms ({source}), "
+                f"construct {self.construct_ms:.1f} ms, show {self.show_ms:.1f} ms, first paint {first_paint}")
+
+class _InstanceWatcher(QObject):
+    def __init__(self, window, timings: LaunchTimings, metrics: AppInstanceMetrics, started_at: float, usage_before):
+        super().__init__(window)
+        self.timings = timings
+        self.metrics = metrics
+        self.started_at = started_at
+        self.usage_before = usage_before
+        self.painted = False
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and not self.painted:
+            self.painted = True
+            self.timings.first_paint_ms = (time.perf_counter() - self.started_at) * 1000
+            self.metrics.first_paint_ms = self.timings.first_paint_ms
+            
+            #in-process apps share the shell's process, so only the launch itself can be attributed to them
+            cpu_time, memory = process_usage()
+            self.metrics.cpu_time_s = max(0.0, cpu_time - self.usage_before[0])
+            self.metrics.memory_bytes = max(0, memory - self.usage_before[1])
+            self.metrics.peak_memory_bytes = self.metrics.memory_bytes
+            LOG_INFO("App launch timings: {}", self.timings)
+        elif event.type() == QEvent.Close:
+            AppsManager().finish_instance(self.metrics.instance_id)
+        return False
 
 class AppLauncher:
+    MAX_TIMINGS = 100
+
+    #package -> (module, source mtime when it was executed)
+    _modules: Dict[str, Tuple[ModuleType, Optional[int]]] = {}
+    _lock = threading.Lock()
+    timings: List[LaunchTimings] = []
+    instances: List[QObject] = []
+    #app_id -> window built ahead of time and still hidden, see prewarm()
+    _warm: Dict[str, QObject] = {}
+    #app_id -> timers of that hidden window, paused until it is shown
+    _paused_timers: Dict[str, List[QTimer]] = {}
+
     @staticmethod
-    def launch_app(app: 'App') -> Tuple[bool, str]:
+    def launch_app(app: 'App', parent=None) -> Tuple[bool, str]:
         try:
-            module = AppLauncher._import_app_module(app) 
-            app_class = AppLauncher._get_main_class(module, app)
+            if app.manifest.isolated:
+                IsolatedAppsManager().launch(app)
+                AppsManager().record_launch(app.app_id)
+                return (True, "Application started in its own process")
             
-            app_instance = app_class()
+            usage_before = process_usage()
+            started_at = time.perf_counter()
+            app_instance = AppLauncher._warm.pop(app.app_id, None)
+            if app_instance is not None:
+                timings = LaunchTimings(app.manifest.package, True, prewarmed=True)
+                if parent is not None and app_instance.parent() is not parent:
+                    app_instance.setParent(parent, app_instance.windowFlags())
+                for timer in AppLauncher._paused_timers.pop(app.app_id, []):
+                    timer.start()
+            else:
+                module, cached = AppLauncher._import_app_module(app)
+                timings = LaunchTimings(app.manifest.package, cached)
+                timings.import_ms = (time.perf_counter() - started_at) * 1000
+
+                step = time.perf_counter()
+                app_instance = AppLauncher._create_instance(module, app, parent)
+                timings.construct_ms = (time.perf_counter() - step) * 1000
+
+            if isinstance(app_instance, QMainWindow):
+                app_instance.setWindowFlags(
+                    Qt.Window |
+                    Qt.WindowCloseButtonHint |
+                    Qt.WindowMinimizeButtonHint |
+                    Qt.WindowMaximizeButtonHint
+                )
+                app_instance.setWindowModality(Qt.NonModal)
+
+            metrics = AppInstanceMetrics(uuid.uuid4().hex, app.app_id, app.name, pid=os.getpid(),
+                                         import_ms=timings.import_ms, construct_ms=timings.construct_ms)
+            _InstanceWatcher(app_instance, timings, metrics, started_at, usage_before)
+            step = time.perf_counter()
             app_instance.show()
-            
+            app_instance.raise_()
+            app_instance.activateWindow()
+            timings.show_ms = (time.perf_counter() - step) * 1000
+
+            AppLauncher._track(app_instance, timings)
+            AppsManager().track_instance(metrics)
+            AppsManager().record_launch(app.app_id)
             return (True, "Application started successfully")
-            
+
         except Exception as e:
             return (False, f"Failed to start application: {str(e)}")
 
     @staticmethod
-    def _import_app_module(app: 'App') -> ModuleType:
+    def prewarm(app: 'App', parent=None) -> bool:
+        """Constrói a janela do app sem mostrá-la; a próxima abertura desse app só precisa exibi-la."""
+        if app.manifest.isolated or app.app_id in AppLauncher._warm:
+            return False
+        #an app that is already open will not be opened again soon
+        if any(metrics.app_id == app.app_id for metrics in AppsManager().get_active_apps()):
+            return False
+        
+        module, _ = AppLauncher._import_app_module(app)
+        window = AppLauncher._create_instance(module, app, parent)
+        #a window nobody sees must not poll or refresh in the meantime
+        timers = [timer for timer in window.findChildren(QTimer) if timer.isActive()]
+        for timer in timers:
+            timer.stop()
+        AppLauncher._paused_timers[app.app_id] = timers
+        AppLauncher._warm[app.app_id] = window
+        window.destroyed.connect(lambda *_, app_id=app.app_id, window=window: AppLauncher._forget_prewarmed(app_id, window))
+        return True
+    
+    @staticmethod
+    def _forget_prewarmed(app_id: str, window) -> None:
+        if AppLauncher._warm.get(app_id) is window:
+            del AppLauncher._warm[app_id]
+            AppLauncher._paused_timers.pop(app_id, None)
+    
+    @staticmethod
+    def discard_prewarmed(app_id: str) -> None:
+        window = AppLauncher._warm.pop(app_id, None)
+        AppLauncher._paused_timers.pop(app_id, None)
+        if window is not None:
+            window.deleteLater()
+    
+    @staticmethod
+    def is_prewarmed(app_id: str) -> bool:
+        return app_id in AppLauncher._warm
+    
+    @staticmethod
+    def _track(app_instance, timings: LaunchTimings) -> None:
+        AppLauncher.timings.append(timings)
+        del AppLauncher.timings[:-AppLauncher.MAX_TIMINGS]
+
+        #windows without a parent would be garbage collected as soon as this returns
+        AppLauncher.instances.append(app_instance)
+        app_instance.destroyed.connect(lambda *_: AppLauncher.instances.remove(app_instance)
+                                       if app_instance in AppLauncher.instances else None)
+
+    @staticmethod
+    def _source_mtime(module_name: str, module: Optional[ModuleType] = None) -> Optional[int]:
+        origin = getattr(module, "__file__", None) if module is not None else None
+        if origin is None:
+            spec = importlib.util.find_spec(module_name)
+            origin = spec.origin if spec else None
         try:
-            if app.manifest.package not in sys.modules:
-                module = importlib.import_module(app.manifest.package)
-            else:
-                module = importlib.reload(sys.modules[app.manifest.package])
-            return module
+            return os.stat(origin).st_mtime_ns if origin else None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _import_app_module(app: 'App') -> Tuple[ModuleType, bool]:
+        """Importa o módulo do app uma vez; só executa de novo se o arquivo fonte mudou. Retorna (módulo, veio do cache)."""
+        package = app.manifest.package
+        try:
+            with AppLauncher._lock:
+                cached = AppLauncher._modules.get(package)
+                if cached is not None:
+                    module, mtime = cached
+                    current_mtime = AppLauncher._source_mtime(package, module)
+                    if current_mtime == mtime:
+                        return module, True
+                    LOG_INFO("Source of {} changed, reloading", package)
+                    module = importlib.reload(module)
+                else:
+                    #import_module also waits for a module a preload thread is still executing
+                    module = importlib.import_module(package)
+                    current_mtime = AppLauncher._source_mtime(package, module)
+
+                AppLauncher._modules[package] = (module, current_mtime)
+                return module, False
         except ImportError as e:
-            raise RuntimeError(f"Failed to import module {app.manifest.package}: {str(e)}")
+            raise RuntimeError(f"Failed to import module {package}: {str(e)}")
+
+    @staticmethod
+    def _create_instance(module: ModuleType, app: 'App', parent=None):
+        if hasattr(module, 'create_app_instance'):
+            app_instance = module.create_app_instance(parent=parent)
+        else:
+            app_class = AppLauncher._get_main_class(module, app)
+            app_instance = app_class(parent=parent)
+
+        if not app_instance:
+            raise RuntimeError("Instância do aplicativo não foi criada")
+        return app_instance
 
     @staticmethod
     def _get_main_class(module: ModuleType, app: 'App') -> type:
@@ -0,0 +1,97 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from system.core.log import *
+from system.core.lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
+
+@dataclass
+class AppInstanceMetrics:
+    """Custos de uma instância de app. Em apps isolados, CPU e memória são do processo inteiro;
+    nos que rodam no processo do shell, são o custo medido durante a abertura (até a primeira pintura)."""
+    instance_id: str
+    app_id: str
+    app_name: str
+    isolated: bool = False
+    pid: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+    import_ms: Optional[float] = None
+    construct_ms: Optional[float] = None
+    first_paint_ms: Optional[float] = None
+    cpu_time_s: float = 0.0
+    memory_bytes: int = 0
+    peak_memory_bytes: int = 0
+    running: bool = True
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+def process_usage(pid: Optional[int] = None):
+    """Retorna (tempo de CPU em segundos, memória residente em bytes) de um processo, ou do atual."""
+    process = psutil.Process(pid) if pid is not None else psutil.Process()
+    cpu = process.cpu_times()
+    return cpu.user + cpu.system, process.memory_info().rss
+
+class AppMetricsSampler(QObject):
+    """Amostra periodicamente CPU e memória dos apps isolados que ainda estão rodando."""
+    SAMPLE_INTERVAL = 2000
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AppMetricsSampler, cls).__new__(cls)
+            cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        super().__init__()
+        self.__initialized = True
+
+        self.watched: Dict[str, AppInstanceMetrics] = {}
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+
+    def watch(self, metrics: AppInstanceMetrics) -> None:
+        self.watched[metrics.instance_id] = metrics
+        self.sample()
+        if not self.timer.isActive():
+            self.timer.start(self.SAMPLE_INTERVAL)
+
+    def unwatch(self, instance_id: str) -> None:
+        self.watched.pop(instance_id, None)
+        if not self.watched:
+            self.timer.stop()
+
+    def sample(self) -> None:
+        for instance_id, metrics in list(self.watched.items()):
+            if metrics.pid is None or not metrics.running:
+                continue
+            try:
+                metrics.cpu_time_s, metrics.memory_bytes = process_usage(metrics.pid)
+                metrics.peak_memory_bytes = max(metrics.peak_memory_bytes, metrics.memory_bytes)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.unwatch(instance_id)
+
+def summarize_instances(instances: List[AppInstanceMetrics]) -> Dict:
+    """Agrega as instâncias de um mesmo app: quantidade, médias das latências e maiores custos."""
+    def average(values):
+        values = [v for v in values if v is not None]
+        return round(sum(values) / len(values), 2) if values else None
+
+    return {
+        "launches": len(instances),
+        "running": sum(1 for m in instances if m.running),
+        "avg_import_ms": average(m.import_ms for m in instances),
+        "avg_construct_ms": average(m.construct_ms for m in instances),
+        "avg_first_paint_ms": average(m.first_paint_ms for m in instances),
+        "last_first_paint_ms": instances[-1].first_paint_ms if instances else None,
+        "total_cpu_time_s": round(sum(m.cpu_time_s for m in instances), 3),
+        "peak_memory_bytes": max((m.peak_memory_bytes for m in instances), default=0)
+    }
\ No newline at end of file
@@ -0,0 +1,170 @@
+from typing import List, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QEvent, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from system.core.constants import *
+from system.core.log import *
+from system.core.apps_manager import AppsManager
+from system.core.app_dependencies import AppPreloader
+from system.core.app_launcher import AppLauncher
+from system.core.app_metrics import process_usage
+from system.ui.icon_cache import IconCache
+
+class AppPrewarmer(QObject):
+    """Depois do login, enquanto ninguém mexe no sistema, aquece os apps que o usuário mais abre neste horário:
+    importa os módulos, decodifica os ícones e, se APP_PREWARM_WINDOWS estiver ligado e couber no orçamento de memória,
+    já constrói a janela escondida (com os timers parados até ser aberta)."""
+    warmed = Signal(str)
+
+    #input that means the user is busy; any of these postpones the next step
+    USER_EVENTS = (QEvent.MouseButtonPress, QEvent.KeyPress, QEvent.Wheel, QEvent.MouseMove)
+    #pause between steps while the system stays idle, so the event loop keeps running in between
+    STEP_INTERVAL = 50
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AppPrewarmer, cls).__new__(cls)
+            cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        super().__init__()
+        self.__initialized = True
+
+        self.max_apps = APP_PREWARM_MAX_APPS
+        self.memory_budget = APP_PREWARM_MEMORY_BUDGET_BYTES
+        self.construct_windows = APP_PREWARM_WINDOWS
+
+        #("import", app) first, then ("window", app) once its modules are loaded
+        self.steps: List[Tuple[str, 'App']] = []
+        self.apps: List['App'] = []
+        #apps whose warm-up has not finished or failed yet
+        self.remaining: Set[str] = set()
+        self.launch_parent = None
+        self.baseline_memory = 0
+        self.active = False
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self._step)
+
+    def start(self, parent=None, when: Optional[float] = None) -> List['App']:
+        """Começa a aquecer os apps previstos para o horário; parent é o widget onde eles serão abertos."""
+        if self.active:
+            return self.apps
+
+        self.apps = [app for app in AppsManager().predict_apps(when, self.max_apps) if not app.manifest.isolated]
+        if not self.apps:
+            LOG_INFO("No launch history yet, nothing to prewarm")
+            return []
+
+        self.active = True
+        self.launch_parent = parent
+        self.steps = [("import", app) for app in self.apps]
+        self.remaining = {app.app_id for app in self.apps}
+        self.baseline_memory = process_usage()[1]
+
+        AppPreloader().preloaded.connect(self._on_preloaded)
+        AppPreloader().failed.connect(self._on_failed)
+        QApplication.instance().installEventFilter(self)
+        self.idle_timer.start(APP_PREWARM_IDLE_MS)
+        LOG_INFO("Prewarming apps when idle: {}", ", ".join(app.name for app in self.apps))
+        return self.apps
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        self.active = False
+        self.steps = []
+        self.remaining = set()
+        self.idle_timer.stop()
+        QApplication.instance().removeEventFilter(self)
+        AppPreloader().preloaded.disconnect(self._on_preloaded)
+        AppPreloader().failed.disconnect(self._on_failed)
+
+    def memory_used(self) -> int:
+        """Quanto a memória do shell cresceu desde o início do aquecimento."""
+        return max(0, process_usage()[1] - self.baseline_memory)
+
+    def eventFilter(self, watched, event):
+        if event.type() in self.USER_EVENTS and self.idle_timer.isActive():
+            self.idle_timer.start(APP_PREWARM_IDLE_MS)
+        return False
+
+    def _step(self):
+        if not self.steps:
+            return
+        if self.memory_used() >= self.memory_budget:
+            LOG_INFO("Prewarm memory budget of {} MB reached, stopping", self.memory_budget // (1024 * 1024))
+            self.stop()
+            return
+
+        stage, app = self.steps.pop(0)
+        try:
+            if stage == "import":
+                self._warm_imports(app)
+            else:
+                self._warm_window(app)
+        except Exception as e:
+            LOG_ERROR("Could not prewarm {}: {}", app.name, e)
+            self._finish(app.app_id)
+
+        if self.steps:
+            self.idle_timer.start(self.STEP_INTERVAL)
+
+    def _warm_imports(self, app):
+        if app.has_icon():
+            IconCache().preload([app.icon_path])
+
+        preloader = AppPreloader()
+        if preloader.preload(app) or app.app_id in preloader.pending:
+            #preloaded or failed will arrive for it
+            return
+        if app.manifest.package in preloader.loaded:
+            #already imported (by the start menu, for example); go straight to the window
+            self._on_preloaded(app.app_id, 0.0)
+        else:
+            #it failed before (or cannot be resolved) and no signal will come for it
+            self._finish(app.app_id)
+
+    def _on_preloaded(self, app_id, elapsed_ms):
+        app = next((app for app in self.apps if app.app_id == app_id), None)
+        if app is None or app_id not in self.remaining:
+            return
+        if self.construct_windows:
+            self.steps.append(("window", app))
+            if not self.idle_timer.isActive():
+                self.idle_timer.start(self.STEP_INTERVAL)
+        else:
+            self.warmed.emit(app_id)
+            self._finish(app_id)
+
+    def _on_failed(self, app_id, error):
+        self._finish(app_id)
+
+    def _finish(self, app_id):
+        self.remaining.discard(app_id)
+        if self.active and not self.remaining:
+            LOG_INFO("Prewarm finished, {:.1f} MB used", self.memory_used() / (1024 * 1024))
+            self.stop()
+
+    def _warm_window(self, app):
+        before = process_usage()[1]
+        if not AppLauncher.prewarm(app, self.launch_parent):
+            self._finish(app.app_id)
+            return
+        #a window that does not fit in what is left of the budget is thrown away
+        if self.memory_used() > self.memory_budget:
+            AppLauncher.discard_prewarmed(app.app_id)
+            LOG_INFO("Prewarmed window of {} exceeds the memory budget, discarded", app.name)
+            self.stop()
+            return
+
+        LOG_INFO("Prewarmed window of {} (+{:.1f} MB)", app.name, (process_usage()[1] - before) / (1024 * 1024))
+        self.warmed.emit(app.app_id)
+        self._finish(app.app_id)
\ No newline at end of file
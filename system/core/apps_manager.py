@@ -1,43 +1,120 @@
 import os
 import json
-from typing import List
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 
 from system.core.app import App, AppManifest, AppVersion
 from system.core.constants import *
 from .log import *
+from .fileio import atomic_write_json
+from .app_metrics import AppInstanceMetrics, summarize_instances
+from .lazy_import import lazy_import
+
+mount_bundle = lazy_import("system.core.app_bundles", "mount_bundle")
+
+class AppsTransaction:
+    """Acumula registros e remoções de apps; nada muda até o commit, que valida tudo junto e grava uma única vez."""
+    
+    def __init__(self, manager: "AppsManager"):
+        self.manager = manager
+        self.operations: List[Tuple[str, object]] = []
+        self.committed = False
+    
+    def register(self, app: App) -> None:
+        if not isinstance(app, App):
+            raise TypeError("Expected App instance")
+        self.operations.append(("register", app))
+    
+    def remove(self, app_id: str) -> None:
+        self.operations.append(("remove", app_id))
+    
+    def commit(self) -> None:
+        if self.committed:
+            raise RuntimeError("Apps transaction already committed")
+        self.manager._commit(self.operations)
+        self.committed = True
 
 class AppsManager:
     _instance = None
+    METRICS_HISTORY = 200
+    #launches within this many seconds are saved to apps_usage.json together, off the GUI thread
+    USAGE_SAVE_DELAY = 5.0
+    #benchmark runs turn this off so their launches do not skew predict_apps()
+    record_usage = True
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.__init__()
+            cls._instance = super(AppsManager, cls).__new__(cls)
+            cls._instance.__initialized = False
         return cls._instance
     
     def __init__(self):
-        if not hasattr(self, 'apps'):
-            self.apps = []
-            self.active_apps = []
-            self.apps_data_file = APPS_DATA_FILENAME
-            self._load_apps()
+        #every AppsManager() call lands here; after the first load it only checks whether apps.json changed
+        if self.__initialized:
+            self.refresh()
+            return
+        self.__initialized = True
         
-        self.apps: List[App] = []
-        self.active_apps: List[App] = []
+        self.apps_by_id: Dict[str, App] = {}
+        self.apps_by_package: Dict[str, App] = {}
+        #running instances and a bounded history of closed ones, for per-app accounting
+        self.active_apps: List[AppInstanceMetrics] = []
+        self.instance_history = deque(maxlen=self.METRICS_HISTORY)
         self.apps_data_file = APPS_DATA_FILENAME
+        self._file_signature = None
+        self._lock = threading.RLock()
         
         self._load_apps()
         
-    def _load_apps(self) -> None:
+        #app_id -> {"launches": total, "hours": launches per hour of the day, "last_launch": timestamp}
+        self.usage_file = APPS_USAGE_FILENAME
+        self.usage: Dict[str, Dict] = self._load_usage()
+        self._usage_timer: Optional[threading.Timer] = None
+        self._usage_save_lock = threading.Lock()
+        atexit.register(self.flush_usage)
+    
+    @property
+    def apps(self) -> List[App]:
+        return list(self.apps_by_id.values())
+    
+    def _read_file_signature(self):
         try:
-            if not os.path.exists(self.apps_data_file) or os.path.getsize(self.apps_data_file) == 0:
-                LOG_WARN("Apps registry file not found or empty, creating default...")
-                self._create_default_registry()
-                return
-                
-            with open(self.apps_data_file, "r", encoding="utf-8") as f:
-                apps_data = json.load(f)
-                
+            stat = os.stat(self.apps_data_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def refresh(self) -> bool:
+        """Recarrega o registro só se o apps.json mudou (mtime ou tamanho) desde a última leitura ou escrita."""
+        if self._read_file_signature() == self._file_signature:
+            return False
+        LOG_INFO("Apps registry changed on disk, reloading")
+        self._load_apps()
+        return True
+    
+    def _index_app(self, app: App) -> None:
+        self.apps_by_id[app.manifest.app_id] = app
+        self.apps_by_package[app.manifest.package] = app
+        
+    def _load_apps(self) -> None:
+        with self._lock:
+            self.apps_by_id = {}
+            self.apps_by_package = {}
+            self._file_signature = self._read_file_signature()
+            
+            try:
+                if not os.path.exists(self.apps_data_file) or os.path.getsize(self.apps_data_file) == 0:
+                    LOG_WARN("Apps registry file not found or empty, creating default...")
+                    self._create_default_registry()
+                    return
+                    
+                with open(self.apps_data_file, "r", encoding="utf-8") as f:
+                    apps_data = json.load(f)
+                    
                 if not isinstance(apps_data, list):
                     raise ValueError("Invalid apps registry format - expected list")
                 
@@ -45,64 +122,208 @@ class AppsManager:
                     try:
                         manifest = AppManifest.from_dict(app_data)
                         icon_path = app_data.get("icon_path")
-                        app = App(manifest, icon_path=icon_path)
-                        self.apps.append(app)
+                        bundle_path = app_data.get("bundle_path")
+                        if bundle_path:
+                            #apps installed from a bundle are imported from their extracted copy in the cache
+                            mount_bundle(manifest, bundle_path)
+                        app = App(manifest, icon_path=icon_path, bundle_path=bundle_path)
+                        self._index_app(app)
                         LOG_INFO(f"Loaded app: {app.name}, icon: {app.icon_path}")
                     except Exception as e:
                         LOG_ERROR(f"Failed to load app {app_data.get('name')}: {str(e)}")
                         continue
                 
-                if not self.apps:
+                if not self.apps_by_id:
                     LOG_WARN("No valid applications found in registry")
                     self._create_default_registry()
                 else:
-                    LOG_INFO(f"Successfully loaded {len(self.apps)} applications")
-                    
-        except json.JSONDecodeError:
-            LOG_ERROR("Invalid JSON format in apps registry")
-            self._create_default_registry()
-        except Exception as e:
-            LOG_FATAL(f"Failed to load apps: {str(e)}")
-            self._create_default_registry()
+                    LOG_INFO(f"Successfully loaded {len(self.apps_by_id)} applications")
+                        
+            except json.JSONDecodeError:
+                LOG_ERROR("Invalid JSON format in apps registry")
+                self._create_default_registry()
+            except Exception as e:
+                LOG_FATAL(f"Failed to load apps: {str(e)}")
+                self._create_default_registry()
     
     def _create_default_registry(self) -> None:  
         self.install_default_apps()
     
     def _save_apps(self) -> None:
-        apps_data = []
-        for app in self.apps:
-            app_data = app.to_dict()
-            apps_data.append(app_data)
+        apps_data = [app.to_dict() for app in self.apps_by_id.values()]
         
-        with open(self.apps_data_file, "w", encoding="utf-8") as f:
-            json.dump(apps_data, f, indent=4)
+        with self._lock:
+            atomic_write_json(self.apps_data_file, apps_data, indent=4)
+            #our own write must not look like an external change
+            self._file_signature = self._read_file_signature()
     
-    def register_app(self, app: App) -> None:
-        if not isinstance(app, App):
-            raise TypeError("Expected App instance")
+    @contextmanager
+    def transaction(self):
+        """Uso: with manager.transaction() as txn: txn.register(app); txn.remove(app_id).
+        Se o bloco levantar uma exceção, nada é aplicado."""
+        txn = AppsTransaction(self)
+        yield txn
+        txn.commit()
+    
+    def _commit(self, operations: List[Tuple[str, object]]) -> None:
+        with self._lock:
+            apps_by_id = dict(self.apps_by_id)
+            errors = []
+            registered, removed = [], []
+            
+            for operation, value in operations:
+                if operation == "register":
+                    if value.manifest.app_id in apps_by_id:
+                        errors.append(f"App with ID {value.manifest.app_id} already exists")
+                        continue
+                    apps_by_id[value.manifest.app_id] = value
+                    registered.append(value)
+                else:
+                    app = apps_by_id.pop(value, None)
+                    if app is None:
+                        errors.append(f"App with ID {value} not found")
+                        continue
+                    removed.append(app)
+            
+            apps_by_package = {}
+            for app in apps_by_id.values():
+                if app.manifest.package in apps_by_package:
+                    errors.append(f"Package {app.manifest.package} is used by more than one app")
+                apps_by_package[app.manifest.package] = app
             
-        if any(a.manifest.app_id == app.manifest.app_id for a in self.apps):
-            raise ValueError(f"App with ID {app.manifest.app_id} already exists")
+            if errors:
+                raise ValueError("; ".join(errors))
+            if not registered and not removed:
+                return
             
-        self.apps.append(app)
-        self._save_apps()
-        LOG_INFO(f"Registered new app: {app.manifest.name}")
+            previous = (self.apps_by_id, self.apps_by_package)
+            self.apps_by_id, self.apps_by_package = apps_by_id, apps_by_package
+            try:
+                self._save_apps()
+            except Exception:
+                self.apps_by_id, self.apps_by_package = previous
+                raise
+        
+        for app in registered:
+            LOG_INFO(f"Registered new app: {app.manifest.name}")
+        for app in removed:
+            LOG_INFO(f"Removed app: {app.manifest.name}")
+    
+    def register_app(self, app: App) -> None:
+        with self.transaction() as txn:
+            txn.register(app)
     
     def remove_app(self, app_id: str) -> None:
-        for i, app in enumerate(self.apps):
-            if app.manifest.app_id == app_id:
-                removed = self.apps.pop(i)
-                self._save_apps()
-                LOG_INFO(f"Removed app: {removed.manifest.name}")
-                return
-        raise ValueError(f"App with ID {app_id} not found")
+        with self.transaction() as txn:
+            txn.remove(app_id)
     
     def get_app(self, app_id: str) -> App:
-        for app in self.apps:
-            if app.manifest.app_id == app_id:
-                return app
-        raise ValueError(f"App with ID {app_id} not found")
+        app = self.apps_by_id.get(app_id)
+        if app is None:
+            raise ValueError(f"App with ID {app_id} not found")
+        return app
+    
+    def get_app_by_package(self, package: str) -> App:
+        app = self.apps_by_package.get(package)
+        if app is None:
+            raise ValueError(f"App with package {package} not found")
+        return app
+    
+    def track_instance(self, metrics: AppInstanceMetrics) -> None:
+        self.active_apps.append(metrics)
+    
+    def finish_instance(self, instance_id: str) -> None:
+        metrics = self.get_instance(instance_id)
+        if metrics is None or not metrics.running:
+            return
+        metrics.running = False
+        self.active_apps.remove(metrics)
+        self.instance_history.append(metrics)
+    
+    def get_instance(self, instance_id: str) -> Optional[AppInstanceMetrics]:
+        return next((m for m in self.active_apps if m.instance_id == instance_id), None)
+    
+    def get_active_apps(self) -> List[AppInstanceMetrics]:
+        return list(self.active_apps)
+    
+    def get_app_metrics(self, app_id: str) -> Dict:
+        """Latência de abertura, CPU e memória agregadas de todas as instâncias (abertas e fechadas) de um app."""
+        instances = [m for m in list(self.instance_history) + self.active_apps if m.app_id == app_id]
+        instances.sort(key=lambda m: m.started_at)
+        return summarize_instances(instances)
+    
+    def _load_usage(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.usage_file):
+            return {}
+        try:
+            with open(self.usage_file, "r", encoding="utf-8") as f:
+                usage = json.load(f)
+            if not isinstance(usage, dict):
+                raise ValueError("expected an object")
+            return {app_id: stats for app_id, stats in usage.items()
+                    if isinstance(stats, dict) and len(stats.get("hours", [])) == 24}
+        except (OSError, ValueError) as e:
+            LOG_WARN(f"Ignoring invalid apps usage file: {e}")
+            return {}
+    
+    def record_launch(self, app_id: str, when: Optional[float] = None) -> None:
+        if not self.record_usage:
+            return
+        when = when if when is not None else time.time()
+        hour = time.localtime(when).tm_hour
+        
+        with self._lock:
+            stats = self.usage.setdefault(app_id, {"launches": 0, "hours": [0] * 24, "last_launch": None})
+            stats["launches"] += 1
+            stats["hours"][hour] += 1
+            stats["last_launch"] = when
+            
+            if self._usage_timer is None:
+                self._usage_timer = threading.Timer(self.USAGE_SAVE_DELAY, self.flush_usage)
+                self._usage_timer.daemon = True
+                self._usage_timer.start()
+    
+    def flush_usage(self) -> None:
+        """Grava as aberturas pendentes agora; normalmente roda no timer de record_launch e na saída."""
+        with self._usage_save_lock:
+            with self._lock:
+                if self._usage_timer is None:
+                    return
+                self._usage_timer.cancel()
+                self._usage_timer = None
+                usage = {app_id: dict(stats, hours=list(stats["hours"])) for app_id, stats in self.usage.items()}
+            try:
+                atomic_write_json(self.usage_file, usage)
+            except OSError as e:
+                LOG_WARN(f"Could not save apps usage: {e}")
+    
+    def get_usage(self, app_id: str) -> Dict:
+        stats = self.usage.get(app_id)
+        if stats is None:
+            return {"launches": 0, "hours": [0] * 24, "last_launch": None}
+        return {"launches": stats["launches"], "hours": list(stats["hours"]), "last_launch": stats["last_launch"]}
+    
+    def predict_apps(self, when: Optional[float] = None, limit: int = APP_PREWARM_MAX_APPS) -> List[App]:
+        """Apps mais prováveis de serem abertos no horário dado (agora, por padrão): pesa as aberturas
+        nesta hora e nas vizinhas, com um peso pequeno para o total de aberturas."""
+        hour = time.localtime(when if when is not None else time.time()).tm_hour
+        
+        scored = []
+        for app_id, stats in self.usage.items():
+            app = self.apps_by_id.get(app_id)
+            if app is None:
+                continue
+            hours = stats["hours"]
+            score = hours[hour] + 0.5 * (hours[hour - 1] + hours[(hour + 1) % 24]) + 0.1 * stats["launches"]
+            if score > 0:
+                scored.append((score, stats["last_launch"] or 0, app))
+        
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [app for _, _, app in scored[:limit]]
     
+    def get_all_app_metrics(self) -> Dict[str, Dict]:
+        launched = {m.app_id: m.app_name for m in list(self.instance_history) + self.active_apps}
+        return {app_id: dict(self.get_app_metrics(app_id), name=name) for app_id, name in launched.items()}
     
     def install_default_apps(self) -> None:
         default_apps_data = [
@@ -142,13 +363,13 @@ class AppsManager:
         ]
         
         for app_data in default_apps_data:
-            if not any(app.app_id == app_data["manifest"].app_id for app in self.apps):
+            if app_data["manifest"].app_id not in self.apps_by_id:
                 try:
                     new_app = App(
                         manifest=app_data["manifest"],
                         icon_path=app_data["icon"]
                     )
-                    self.apps.append(new_app)
+                    self._index_app(new_app)
                     LOG_INFO(f"Added default app: {app_data['manifest'].name}")
                 except Exception as e:
                     LOG_ERROR(f"Failed to add default app {app_data['manifest'].name}: {str(e)}")
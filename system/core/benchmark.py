@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import math
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+from . import constants as CONSTS
+from .boot_profiler import BootProfiler
+from .log import *
+
+BENCHMARK_RESULT_PREFIX = "LS013_BENCHMARK_RESULT "
+DEFAULT_BENCHMARK_USER = "admin"
+DEFAULT_BENCHMARK_PASSWORD = "123"
+DEFAULT_BENCHMARK_TIMEOUT = 60000
+
+class BenchmarkDriver(QObject):
+    """Conduz uma iteração do benchmark: splash -> login -> desktop -> app -> desligamento, sem interação."""
+
+    def __init__(self, system, username=DEFAULT_BENCHMARK_USER, password=DEFAULT_BENCHMARK_PASSWORD,
+                 app_id=CONSTS.SYSTEM_APP_ID, timeout=DEFAULT_BENCHMARK_TIMEOUT):
+        super().__init__(system)
+        self.system = system
+        self.username = username
+        self.password = password
+        self.app_id = app_id
+        self.error = None
+        self.reported = False
+
+        system.screen_changed.connect(self._on_screen_changed)
+        QApplication.instance().aboutToQuit.connect(self._report)
+
+        #a stuck step must not hang the whole benchmark run
+        QTimer.singleShot(timeout, self._on_timeout)
+
+    def _on_screen_changed(self, screen):
+        if screen == "login":
+            QTimer.singleShot(0, self._submit_login)
+        elif screen == "desktop":
+            QTimer.singleShot(0, self._launch_app)
+
+    def _submit_login(self):
+        login = self.system.login
+        login.username_input.setText(self.username)
+        login.password_input.setText(self.password)
+        login.login_button.click()
+
+    def _launch_app(self):
+        with BootProfiler.phase("app_launch"):
+            self.system.desktop.launch_application(self.app_id)
+        QTimer.singleShot(0, self._shutdown)
+
+    def _shutdown(self):
+        BootProfiler.begin("shutdown")
+        self.system.request_shutdown()
+
+    def _on_timeout(self):
+        self.error = "timed out"
+        LOG_ERROR("Benchmark iteration timed out")
+        QApplication.quit()
+
+    def _report(self):
+        if self.reported:
+            return
+        self.reported = True
+        BootProfiler.end("shutdown")
+        BootProfiler.mark("quit")
+
+        report = BootProfiler.build_report()
+        report["error"] = self.error
+        print(BENCHMARK_RESULT_PREFIX + json.dumps(report), flush=True)
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    summary = {}
+    for name, values in samples.items():
+        summary[name] = {
+            "samples": len(values),
+            "min_ms": round(min(values), 2),
+            "median_ms": round(statistics.median(values), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "max_ms": round(max(values), 2)
+        }
+    return summary
+
+def _collect_samples(reports: List[Dict]) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {}
+    for report in reports:
+        for phase in report["phases"]:
+            if phase["name"] == "quit":
+                samples.setdefault("total", []).append(phase["end_ms"])
+            else:
+                samples.setdefault(phase["name"], []).append(phase["duration_ms"])
+
+        for metric in ("time_to_desktop_ms", "time_to_desktop_without_login_ms"):
+            if report.get(metric) is not None:
+                samples.setdefault(metric[:-3], []).append(report[metric])
+    return samples
+
+def run_iteration(main_path: str, username: str, password: str, app_id: str, extra_args: List[str]) -> Optional[Dict]:
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+
+    #iterations must neither be sped up by prewarming nor feed their launches into the real usage statistics
+    args = [sys.executable, main_path, "-benchmarkrun", "-noprewarm", "-nousagestats",
+            "-benchuser", username, "-benchpassword", password, "-benchapp", app_id] + extra_args
+    result = subprocess.run(args, env=env, capture_output=True, text=True,
+                            timeout=DEFAULT_BENCHMARK_TIMEOUT / 1000 * 2)
+
+    for line in result.stdout.splitlines():
+        if line.startswith(BENCHMARK_RESULT_PREFIX):
+            return json.loads(line[len(BENCHMARK_RESULT_PREFIX):])
+    return None
+
+def format_benchmark(report: Dict) -> str:
+    lines = [f"{CONSTS.SYSTEM_NAME} benchmark - {report['started_at']}",
+             f"Iterations: {report['iterations']} ({report['failures']} failed)", ""]
+    lines.append(f"{'phase':<34}{'min (ms)':>12}{'median (ms)':>14}{'p95 (ms)':>12}")
+    for name, stats in report["phases"].items():
+        lines.append(f"{name:<34}{stats['min_ms']:>12.1f}{stats['median_ms']:>14.1f}{stats['p95_ms']:>12.1f}")
+    return "\n".join(lines)
+
+def run_benchmark(iterations: int, main_path: str, username=DEFAULT_BENCHMARK_USER, password=DEFAULT_BENCHMARK_PASSWORD,
+                  app_id=CONSTS.SYSTEM_APP_ID, extra_args: Optional[List[str]] = None, directory=CONSTS.LOGS_PATH):
+    """Roda o fluxo completo `iterations` vezes, cada uma em um processo novo, e grava as estatísticas por fase."""
+    started_at = datetime.now()
+    reports = []
+    failures = 0
+
+    for i in range(iterations):
+        try:
+            report = run_iteration(main_path, username, password, app_id, extra_args or [])
+        except subprocess.TimeoutExpired:
+            report = None
+
+        if report is None or report.get("error") or report.get("time_to_desktop_ms") is None:
+            failures += 1
+            print(f"Iteration {i + 1}/{iterations}: failed")
+            continue
+
+        reports.append(report)
+        print(f"Iteration {i + 1}/{iterations}: time to desktop {report['time_to_desktop_ms']:.1f} ms")
+
+    result = {
+        "started_at": started_at.isoformat(),
+        "iterations": iterations,
+        "failures": failures,
+        "phases": summarize(_collect_samples(reports)) if reports else {},
+        "runs": reports
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    base_path = os.path.join(directory, f"benchmark_{started_at.strftime('%Y%m%d_%H%M%S')}")
+    with open(f"{base_path}.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4)
+    with open(f"{base_path}.txt", "w", encoding="utf-8") as f:
+        f.write(format_benchmark(result))
+
+    return result, base_path
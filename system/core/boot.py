@@ -0,0 +1,134 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from PySide6.QtCore import QObject, Signal, QTimer
+
+from system.core.boot_profiler import BootProfiler
+
+@dataclass
+class BootTask:
+    name: str
+    func: Callable[[], Any]
+    depends_on: List[str] = field(default_factory=list)
+    description: str = ""
+    gui_thread: bool = False
+
+class BootPipeline(QObject):
+    """Executa as etapas de inicialização como um grafo: etapas independentes rodam em paralelo."""
+    task_started = Signal(str)
+    task_finished = Signal(str, float)
+    task_failed = Signal(str, str)
+    progress = Signal(int, int, str)
+    finished = Signal()
+
+    _task_done = Signal(str, object, object, float)
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self.tasks: Dict[str, BootTask] = {}
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = None
+
+        self.done = set()
+        self.running = set()
+        self.started = False
+        self.is_finished = False
+
+        #worker threads report back through a queued signal, so bookkeeping stays on the GUI thread
+        self._task_done.connect(self._on_task_done)
+
+    def add_task(self, task: BootTask) -> None:
+        if self.started:
+            raise RuntimeError("Cannot add tasks to a running boot pipeline")
+        if task.name in self.tasks:
+            raise ValueError(f"Boot task '{task.name}' already exists")
+        self.tasks[task.name] = task
+
+    def _validate(self) -> None:
+        for task in self.tasks.values():
+            for dependency in task.depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(f"Boot task '{task.name}' depends on unknown task '{dependency}'")
+
+        remaining = {name: set(task.depends_on) for name, task in self.tasks.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Boot tasks have a dependency cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def start(self) -> None:
+        if self.started:
+            return
+        self._validate()
+        self.started = True
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="boot")
+
+        if not self.tasks:
+            self._finish()
+            return
+        self._schedule_ready()
+
+    def _schedule_ready(self) -> None:
+        for name, task in self.tasks.items():
+            if name in self.done or name in self.running:
+                continue
+            if not all(dep in self.done for dep in task.depends_on):
+                continue
+
+            failed_deps = [dep for dep in task.depends_on if dep in self.errors]
+            if failed_deps:
+                self._on_task_done(name, None, f"skipped, dependency failed: {', '.join(failed_deps)}", 0.0)
+                continue
+
+            self.running.add(name)
+            self.task_started.emit(name)
+            if task.gui_thread:
+                QTimer.singleShot(0, lambda task=task: self._run_task(task))
+            else:
+                self.executor.submit(self._run_task, task)
+
+    def _run_task(self, task: BootTask) -> None:
+        start = time.perf_counter()
+        try:
+            with BootProfiler.phase(f"boot.{task.name}"):
+                result = task.func()
+            error = None
+        except Exception as e:
+            result = None
+            error = f"{type(e).__name__}: {e}"
+        self._task_done.emit(task.name, result, error, (time.perf_counter() - start) * 1000)
+
+    def _on_task_done(self, name, result, error, elapsed_ms) -> None:
+        self.running.discard(name)
+        self.done.add(name)
+
+        if error is None:
+            self.results[name] = result
+            self.task_finished.emit(name, elapsed_ms)
+        else:
+            self.errors[name] = error
+            self.task_failed.emit(name, error)
+
+        task = self.tasks[name]
+        self.progress.emit(len(self.done), len(self.tasks), task.description or name)
+
+        if len(self.done) == len(self.tasks):
+            self._finish()
+        else:
+            self._schedule_ready()
+
+    def _finish(self) -> None:
+        if self.is_finished:
+            return
+        self.is_finished = True
+        self.executor.shutdown(wait=False)
+        self.finished.emit()
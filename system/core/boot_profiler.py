@@ -0,0 +1,126 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from . import constants as CONSTS
+
+class BootProfiler:
+    """Marca o início e o fim de cada fase do boot, de main.py até a primeira pintura do desktop."""
+    _enabled = False
+    _origin: Optional[float] = None
+    _started_at: Optional[datetime] = None
+    _phases: List[Dict] = []
+    _open: Dict[str, float] = {}
+
+    @staticmethod
+    def init(origin: Optional[float] = None):
+        BootProfiler._origin = origin if origin is not None else time.perf_counter()
+        BootProfiler._started_at = datetime.now()
+        BootProfiler._phases = []
+        BootProfiler._open = {}
+
+    @staticmethod
+    def enable():
+        BootProfiler._enabled = True
+
+    @staticmethod
+    def is_enabled():
+        return BootProfiler._enabled
+
+    @staticmethod
+    def now_ms():
+        if BootProfiler._origin is None:
+            BootProfiler.init()
+        return (time.perf_counter() - BootProfiler._origin) * 1000
+
+    @staticmethod
+    def record(name, start_ms, end_ms):
+        BootProfiler._phases.append({
+            "name": name,
+            "start_ms": round(start_ms, 2),
+            "end_ms": round(end_ms, 2),
+            "duration_ms": round(end_ms - start_ms, 2)
+        })
+
+    @staticmethod
+    def begin(name):
+        BootProfiler._open[name] = BootProfiler.now_ms()
+
+    @staticmethod
+    def end(name):
+        start = BootProfiler._open.pop(name, None)
+        if start is not None:
+            BootProfiler.record(name, start, BootProfiler.now_ms())
+
+    @staticmethod
+    def mark(name):
+        now = BootProfiler.now_ms()
+        BootProfiler.record(name, now, now)
+
+    @staticmethod
+    @contextmanager
+    def phase(name):
+        BootProfiler.begin(name)
+        try:
+            yield
+        finally:
+            BootProfiler.end(name)
+
+    @staticmethod
+    def phases():
+        return list(BootProfiler._phases)
+
+    @staticmethod
+    def duration(name):
+        return next((p["duration_ms"] for p in BootProfiler._phases if p["name"] == name), None)
+
+    @staticmethod
+    def time_to(name):
+        return next((p["end_ms"] for p in BootProfiler._phases if p["name"] == name), None)
+
+    @staticmethod
+    def build_report():
+        time_to_desktop = BootProfiler.time_to("first_paint")
+        login_ms = BootProfiler.duration("login") or 0.0
+        return {
+            "started_at": BootProfiler._started_at.isoformat() if BootProfiler._started_at else None,
+            "time_to_desktop_ms": time_to_desktop,
+            #time spent typing credentials is not boot time
+            "time_to_desktop_without_login_ms": round(time_to_desktop - login_ms, 2) if time_to_desktop is not None else None,
+            "phases": sorted(BootProfiler._phases, key=lambda p: p["start_ms"])
+        }
+
+    @staticmethod
+    def format_report(report):
+        lines = [f"{CONSTS.SYSTEM_NAME} boot report - {report['started_at']}", ""]
+        lines.append(f"{'phase':<28}{'start (ms)':>12}{'end (ms)':>12}{'duration (ms)':>16}")
+        for p in report["phases"]:
+            lines.append(f"{p['name']:<28}{p['start_ms']:>12.1f}{p['end_ms']:>12.1f}{p['duration_ms']:>16.1f}")
+        lines.append("")
+
+        if report["time_to_desktop_ms"] is not None:
+            lines.append(f"Time to desktop: {report['time_to_desktop_ms']:.1f} ms")
+            lines.append(f"Time to desktop (without login): {report['time_to_desktop_without_login_ms']:.1f} ms")
+        else:
+            lines.append("Desktop was not painted")
+        return "\n".join(lines)
+
+    @staticmethod
+    def write_report(directory=CONSTS.LOGS_PATH):
+        if not BootProfiler._enabled:
+            return None
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = (BootProfiler._started_at or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(directory, f"boot_{stamp}")
+
+        report = BootProfiler.build_report()
+        with open(f"{base_path}.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as f:
+            f.write(BootProfiler.format_report(report))
+
+        return base_path
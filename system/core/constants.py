@@ -10,6 +10,10 @@ WALLPAPERS_PATH = os.path.abspath(os.path.join(SYSTEM_PATH, "resources", "wallpa
 ICONS_PATH = os.path.abspath(os.path.join(SYSTEM_PATH, "resources", "icons"))
 LOGS_PATH = os.path.abspath(os.path.join(SYSTEM_PATH, "logs"))
 USERS_PATH = os.path.abspath(os.path.join(ROOT_PATH, "users"))
+CACHE_PATH = os.path.abspath(os.path.join(SYSTEM_PATH, "cache"))
+THUMBNAILS_CACHE_PATH = os.path.abspath(os.path.join(CACHE_PATH, "thumbnails"))
+APP_BUNDLES_PATH = os.path.abspath(os.path.join(SYSTEM_PATH, "bundles"))
+APP_BUNDLES_CACHE_PATH = os.path.abspath(os.path.join(CACHE_PATH, "apps"))
 
 #icons path
 RELATIVE_ICONS_DIR = "system/resources/icons"
@@ -19,7 +23,11 @@ UNKNOWN_PACKAGE_ICON = f"{RELATIVE_ICONS_DIR}/unknown_package.png"
 
 #filenames
 APPS_DATA_FILENAME = os.path.join(SYSTEM_PATH, "apps.json")
+APPS_USAGE_FILENAME = os.path.join(SYSTEM_PATH, "apps_usage.json")
 USERS_DATA_FILENAME = os.path.join(USERS_PATH, "users.json")
+USERS_JOURNAL_FILENAME = os.path.join(USERS_PATH, "users.journal")
+USERS_DB_FILENAME = os.path.join(USERS_PATH, "users.db")
+PASSWORD_POLICY_FILENAME = os.path.join(USERS_PATH, "password_policy.json")
 DEFAULT_WALLPAPER_FILENAME = os.path.join(WALLPAPERS_PATH, "login.jpg")
 DEFAULT_DESKTOP_WALLPAPER_FILENAME = os.path.join(WALLPAPERS_PATH, "desktop_2.png")
 LOADING_SPINNER_ICON = os.path.join(ICONS_PATH, "loading_spinner.gif")
@@ -27,6 +35,28 @@ CONFIG_ICON = os.path.join(ICONS_PATH, "config.png")
 POWER_ICON = os.path.join(ICONS_PATH, "power.png")
 APPS_ICON = os.path.join(ICONS_PATH, "apps.png")
 DOCUMENT_ICON = os.path.join(ICONS_PATH, "document.png")
+APP_BUNDLE_MANIFEST_FILENAME = "manifest.json"
+
+#cache limits
+THUMBNAILS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+WALLPAPER_CACHE_MAX_BYTES = 96 * 1024 * 1024
+
+#prewarming of the apps most likely to be opened, while the desktop is idle after login
+APP_PREWARM_MAX_APPS = 3
+APP_PREWARM_IDLE_MS = 2000
+APP_PREWARM_MEMORY_BUDGET_BYTES = 128 * 1024 * 1024
+#building hidden windows starts their work (timers, polling), so it is opt-in
+APP_PREWARM_WINDOWS = False
+
+#users persistence ("json" or "sqlite")
+USERS_STORAGE_BACKEND = "json"
+USERS_JOURNAL_COMPACT_THRESHOLD = 1000
+
+#password hashing
+BCRYPT_DEFAULT_ROUNDS = 12
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 16
+BCRYPT_TARGET_VERIFY_MS = 250
 
 #default apps id
 SYSTEM_APP_ID = "a454c8f5-2b43-4fd1-a485-077a3fe891a1"
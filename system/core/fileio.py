@@ -0,0 +1,51 @@
+import os
+import json
+import tempfile
+
+def atomic_write_json(path, data, indent=None) -> None:
+    """Grava JSON em um arquivo temporário no mesmo diretório e o troca pelo destino; um crash nunca deixa o arquivo pela metade."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def append_json_lines(path, records) -> None:
+    """Acrescenta registros como linhas JSON e força a escrita em disco."""
+    with open(path, "a+b") as f:
+        #a write interrupted mid-line leaves a fragment without "\n"; start on a new line so the record is not glued to it
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        for record in records:
+            f.write((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_json_lines(path):
+    """Lê um arquivo de linhas JSON; retorna (registros, linhas inválidas). Uma escrita interrompida só corrompe a última linha."""
+    records = []
+    invalid = 0
+    if not os.path.exists(path):
+        return records, invalid
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                invalid += 1
+    return records, invalid
\ No newline at end of file
@@ -5,4 +5,8 @@ class SystemFlags(IntFlag):
     SKIP_SPLASH_SCREEN = auto()
     SKIP_SHUTDOWN_SCREEN = auto()
     SKIP_LOGIN_SCREEN = auto()
-    WINDOW_FULLSCREEN = auto()
\ No newline at end of file
+    WINDOW_FULLSCREEN = auto()
+    PROFILE_BOOT = auto()
+    AUDIT_IMPORTS = auto()
+    NO_PREWARM = auto()
+    NO_USAGE_STATS = auto()
\ No newline at end of file
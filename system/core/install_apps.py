@@ -0,0 +1,23 @@
+import sys
+import argparse
+
+from system.core.log import *
+from system.core.app_bundles import install_bundles
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Installs LS013 app bundles")
+    parser.add_argument("bundles", nargs="+", help="zip files with manifest.json, the app package and its icon")
+    parser.add_argument("--workers", type=int, default=None, help="extract and compile processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    Log.init()
+
+    report = install_bundles(args.bundles, max_workers=args.workers)
+
+    for archive, reason in report.failures:
+        print(f"FAILED {archive}: {reason}")
+    print(report)
+    return 0 if not report.failures else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
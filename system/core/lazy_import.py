@@ -0,0 +1,125 @@
+import sys
+import time
+import threading
+import importlib
+import importlib.abc
+from typing import Dict, List, Optional, Tuple
+
+class LazyImport:
+    """Adia a importação de um módulo (ou de um atributo dele) até o primeiro uso."""
+
+    def __init__(self, module_name: str, attr: Optional[str] = None):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = getattr(module, self._attr) if self._attr else module
+        return self._target
+
+    def is_loaded(self) -> bool:
+        return self._target is not None
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        target = f"{self._module_name}.{self._attr}" if self._attr else self._module_name
+        state = "loaded" if self.is_loaded() else "not loaded"
+        return f"<LazyImport {target} ({state})>"
+
+def lazy_import(module_name: str, attr: Optional[str] = None) -> LazyImport:
+    return LazyImport(module_name, attr)
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        ImportAudit._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            ImportAudit._exit(self._name, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+class ImportAudit:
+    """Mede o tempo de cada import feito depois de start() (tempo próprio, sem os imports filhos)."""
+    _finder = None
+    _records: Dict[str, Tuple[float, float]] = {}
+    _local = threading.local()
+
+    @staticmethod
+    def start():
+        if ImportAudit._finder is None:
+            ImportAudit._finder = _TimingFinder()
+            sys.meta_path.insert(0, ImportAudit._finder)
+
+    @staticmethod
+    def stop():
+        if ImportAudit._finder is not None:
+            sys.meta_path.remove(ImportAudit._finder)
+            ImportAudit._finder = None
+
+    @staticmethod
+    def is_active() -> bool:
+        return ImportAudit._finder is not None
+
+    @staticmethod
+    def _stack() -> List[float]:
+        if not hasattr(ImportAudit._local, "stack"):
+            ImportAudit._local.stack = []
+        return ImportAudit._local.stack
+
+    @staticmethod
+    def _enter():
+        ImportAudit._stack().append(0.0)
+
+    @staticmethod
+    def _exit(name, elapsed):
+        stack = ImportAudit._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        ImportAudit._records[name] = (elapsed - children, elapsed)
+
+    @staticmethod
+    def slowest(limit: int = 20) -> List[Tuple[str, float, float]]:
+        """Retorna (módulo, tempo próprio em ms, tempo total em ms), do mais lento para o mais rápido."""
+        ranked = sorted(ImportAudit._records.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, own * 1000, total * 1000) for name, (own, total) in ranked[:limit]]
+
+    @staticmethod
+    def format_report(limit: int = 20) -> str:
+        lines = [f"Slowest imports ({len(ImportAudit._records)} modules audited):"]
+        lines.append(f"{'module':<48}{'self (ms)':>12}{'total (ms)':>12}")
+        for name, own_ms, total_ms in ImportAudit.slowest(limit):
+            lines.append(f"{name:<48}{own_ms:>12.1f}{total_ms:>12.1f}")
+        return "\n".join(lines)
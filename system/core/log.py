@@ -11,6 +11,13 @@ class Log:
         logger.add(os.path.join(CONSTS.LOGS_PATH, "system_{time}.log"), rotation="500 MB")
         logger.info("Initializing Log System")
         Log._logger = logger
+
+    @staticmethod
+    def init_sink(sink):
+        """Como init(), mas sem abrir um arquivo: tudo vai para sink (processos auxiliares, como o host de apps isolados)."""
+        logger.remove()
+        logger.add(sink, level="DEBUG")
+        Log._logger = logger
     
     @staticmethod
     def get_logger():
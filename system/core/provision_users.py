@@ -0,0 +1,49 @@
+import csv
+import sys
+import json
+import argparse
+from typing import Dict, List
+
+from system.core.log import *
+from system.core.users_manager import UsersManager, PasswordPolicy
+
+def load_user_records(path: str) -> List[Dict]:
+    """Lê usuários de um CSV (colunas username, password, privilege) ou de uma lista JSON com as mesmas chaves."""
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON list of users")
+        return records
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk user provisioning")
+    parser.add_argument("file", help="CSV or JSON file with username, password and privilege")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: all cores)")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost for this batch (default: current policy)")
+    args = parser.parse_args(argv)
+
+    Log.init()
+
+    try:
+        records = load_user_records(args.file)
+    except (OSError, ValueError, csv.Error) as e:
+        LOG_ERROR(f"Could not read users file '{args.file}': {e}")
+        return 1
+
+    manager = UsersManager()
+    if args.rounds is not None:
+        manager.set_password_policy(PasswordPolicy(args.rounds), persist=False)
+
+    report = manager.create_users(records, max_workers=args.workers)
+
+    for username, reason in report.failures:
+        print(f"FAILED {username}: {reason}")
+    print(report)
+    return 0 if not report.failures else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
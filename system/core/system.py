@@ -1,51 +1,130 @@
-from PySide6.QtWidgets import QApplication, QGraphicsOpacityEffect
-from PySide6.QtCore import QObject, Signal, QPropertyAnimation, QEasingCurve, QTimer, QPoint, QParallelAnimationGroup
+from PySide6.QtWidgets import QApplication, QGraphicsOpacityEffect, QMessageBox
+from PySide6.QtCore import Qt, QObject, Signal, QPropertyAnimation, QEasingCurve, QTimer, QPoint, QParallelAnimationGroup
 from PySide6.QtGui import QColor, QPainter
 import os
 
 from system.core.system_main_window import SystemMainWindow, WindowMode
 from system.core.flags import SystemFlags
+from system.core.boot import BootPipeline, BootTask
+from system.core.boot_profiler import BootProfiler
 from . import constants as CONSTS
 from .log import *
-from system.ui.internal.splash_screen import SplashScreen
-from system.ui.internal.login_screen import LoginScreen
-from system.ui.internal.shutdown_screen import ShutdownScreen
-from system.ui.desktop.desktop import Desktop
-from system.ui.internal.loading_screen import LoadingScreen
-from system.core.users_manager import UsersManager, UserPrivilege
-from system.core.apps_manager import AppsManager
+from system.core.lazy_import import lazy_import, ImportAudit
+from system.ui.image_decoder import decode_scaled
+
+#screens and heavy managers are only imported when first used, so the first frame does not wait for them
+SplashScreen = lazy_import("system.ui.internal.splash_screen", "SplashScreen")
+LoginScreen = lazy_import("system.ui.internal.login_screen", "LoginScreen")
+ShutdownScreen = lazy_import("system.ui.internal.shutdown_screen", "ShutdownScreen")
+LoadingScreen = lazy_import("system.ui.internal.loading_screen", "LoadingScreen")
+Desktop = lazy_import("system.ui.desktop.desktop", "Desktop")
+DesktopPrefetcher = lazy_import("system.ui.desktop.desktop_prefetcher", "DesktopPrefetcher")
+UsersManager = lazy_import("system.core.users_manager", "UsersManager")
+UserPrivilege = lazy_import("system.core.users_manager", "UserPrivilege")
+AppsManager = lazy_import("system.core.apps_manager", "AppsManager")
+AppLauncher = lazy_import("system.core.app_launcher", "AppLauncher")
+AppPrewarmer = lazy_import("system.core.app_prewarm", "AppPrewarmer")
 
 class LSystem013(QObject):
+    DESKTOP_PREFETCH_TIMEOUT = 5000
+    
+    #"splash", "login", "desktop" (after its first paint) or "shutdown"
+    screen_changed = Signal(str)
+    
     def __init__(self, flags: SystemFlags):
+        super().__init__()
+        
         #configure "low-level system"
         self.flags = flags
         self.login = None
         self.shutdown_ui = None
+        self.desktop = None
         self._active_widgets = []
         self.apps_manager = None
+        self.desktop_prefetcher = None
+        self._pending_desktop_user = None
+        #one timer for the desktop wait, so a wait from an earlier login cannot end a later one
+        self.desktop_wait_timer = QTimer(self)
+        self.desktop_wait_timer.setSingleShot(True)
+        self.desktop_wait_timer.timeout.connect(self._finish_desktop_load)
 
         self.window_mode = WindowMode.MAXIMIZED
         if SystemFlags.WINDOW_FULLSCREEN in self.flags:
             self.window_mode = WindowMode.FULLSCREEN
         
         os.chdir(CONSTS.ROOT_PATH)
+        
+        if SystemFlags.PROFILE_BOOT in self.flags:
+            BootProfiler.enable()
+        
+        if SystemFlags.NO_USAGE_STATS in self.flags:
+            AppsManager.resolve().record_usage = False
 
         #init logger
-        Log.init()
+        with BootProfiler.phase("log_init"):
+            Log.init()
         LOG_INFO("Initializing virtual system {} in: {}", CONSTS.SYSTEM_NAME, os.getcwd())
 
-        self.users_manager = UsersManager()
-        self.users_manager.create_user("admin", "123", UserPrivilege.ADMIN)
+        self.users_manager = None
 
         self.main_window = SystemMainWindow()
-        self.main_window.set_wallpaper(CONSTS.DEFAULT_WALLPAPER_FILENAME)
         self.main_window.show(self.window_mode)
 
+        #boot work runs as a task graph; the splash (if any) only mirrors its progress
+        self.boot = self._create_boot_pipeline()
+        self.boot.task_finished.connect(self._on_boot_task_finished)
+        self.boot.task_failed.connect(self._on_boot_task_failed)
+        self.boot.finished.connect(self._on_boot_finished)
+
         #show system splash screen
+        if SystemFlags.SKIP_SPLASH_SCREEN not in self.flags:
+            self.show_splash_screen()
+        
+        self.boot.start()
+    
+    def _create_boot_pipeline(self):
+        boot = BootPipeline(self)
+        
+        width, height = self.main_window.width(), self.main_window.height()
+        dpr = self.main_window.devicePixelRatioF()
+        
+        def load_users():
+            users_manager = UsersManager()
+            users_manager.create_user("admin", "123", UserPrivilege.ADMIN)
+            return users_manager
+        
+        def decode_wallpaper():
+            image, _ = decode_scaled(CONSTS.DEFAULT_WALLPAPER_FILENAME, int(width * dpr), int(height * dpr),
+                                     Qt.KeepAspectRatioByExpanding)
+            return image
+        
+        def apply_wallpaper():
+            image = boot.results.get("decode_wallpaper")
+            if image is not None and not image.isNull():
+                self.main_window.wallpaper_loader.store(CONSTS.DEFAULT_WALLPAPER_FILENAME, image, width, height, dpr)
+            self.main_window.set_wallpaper(CONSTS.DEFAULT_WALLPAPER_FILENAME)
+        
+        boot.add_task(BootTask("users", load_users, description="Carregando usuários..."))
+        boot.add_task(BootTask("apps", AppsManager, description="Carregando aplicativos..."))
+        boot.add_task(BootTask("decode_wallpaper", decode_wallpaper, description="Carregando papel de parede..."))
+        boot.add_task(BootTask("apply_wallpaper", apply_wallpaper, ["decode_wallpaper"],
+                               description="Aplicando papel de parede...", gui_thread=True))
+        return boot
+    
+    def _on_boot_task_finished(self, name, elapsed_ms):
+        LOG_INFO("Boot task '{}' finished in {:.1f} ms", name, elapsed_ms)
+    
+    def _on_boot_task_failed(self, name, error):
+        LOG_FATAL("Boot task '{}' failed: {}", name, error)
+    
+    def _on_boot_finished(self):
+        self.users_manager = self.boot.results.get("users")
+        self.apps_manager = self.boot.results.get("apps")
+        
         if SystemFlags.SKIP_SPLASH_SCREEN in self.flags:
             self.starting_system()
         else:
-            self.show_splash_screen()
+            self.splash.finish()
     
     def launch_application(self, app_id: str):
         manager = AppsManager()
@@ -57,6 +136,10 @@ class LSystem013(QObject):
                 self.show_error_message(message)
         except Exception as e:
             self.show_error_message(f"Erro crítico: {str(e)}")
+    
+    def show_error_message(self, message):
+        LOG_ERROR("{}", message)
+        QMessageBox.critical(self.main_window, "Erro", message)
             
     def _add_widget(self, widget):
         self._active_widgets.append(widget)
@@ -73,23 +156,53 @@ class LSystem013(QObject):
                 continue
                 
     def show_splash_screen(self):
+        BootProfiler.begin("splash")
         self.main_window.hide_wallpaper()
         self.splash = self._add_widget(SplashScreen())
         self.splash.setFixedSize(self.main_window.size())
         self.main_window.setCentralWidget(self.splash)
+        self.boot.progress.connect(self.splash.update_progress)
         self.splash.finished.connect(self.starting_system)
         self.splash.show()
+        self.screen_changed.emit("splash")
+    
+    def prefetch_desktop(self):
+        if self.desktop_prefetcher is None:
+            self.desktop_prefetcher = DesktopPrefetcher(self.main_window, self)
+            self.desktop_prefetcher.start()
     
     def show_desktop(self, username):
+        BootProfiler.end("login")
+        BootProfiler.begin("desktop_wait")
         self.loading = self._add_widget(LoadingScreen("Preparando o desktop..."))
         self.loading.setFixedSize(self.main_window.size())
         self.main_window.setCentralWidget(self.loading)
         self.loading.show()
         
-        QTimer.singleShot(1500, lambda: self._finish_desktop_load(username))
+        self.prefetch_desktop()
+        self._pending_desktop_user = username
+        
+        #ready is emitted only once, so if it already was the timer finishes the wait right away
+        self.desktop_prefetcher.ready.connect(self._finish_desktop_load)
+        if self.desktop_prefetcher.is_ready():
+            self.desktop_wait_timer.start(0)
+        else:
+            #never keep the user waiting on a resource that does not arrive
+            self.desktop_wait_timer.start(self.DESKTOP_PREFETCH_TIMEOUT)
 
-    def _finish_desktop_load(self, username):
-        self.desktop = Desktop(username, self)
+    def _finish_desktop_load(self):
+        username = self._pending_desktop_user
+        if username is None:
+            return
+        self._pending_desktop_user = None
+        self.desktop_wait_timer.stop()
+        self.desktop_prefetcher.ready.disconnect(self._finish_desktop_load)
+        BootProfiler.end("desktop_wait")
+        
+        with BootProfiler.phase("desktop_construction"):
+            self.desktop = Desktop(username, self)
+        BootProfiler.begin("first_paint")
+        self.desktop.first_painted.connect(self._on_desktop_first_paint)
         self.desktop.wallpaper_change_requested.connect(self.change_wallpaper)
         
         self.desktop.setFixedSize(self.main_window.size())   
@@ -103,25 +216,42 @@ class LSystem013(QObject):
         
         self.loading.deleteLater()
     
+    def _on_desktop_first_paint(self):
+        BootProfiler.end("first_paint")
+        
+        report_path = BootProfiler.write_report()
+        if report_path:
+            LOG_INFO("Boot report written to: {}.txt/.json", report_path)
+        
+        self.screen_changed.emit("desktop")
+        
+        if SystemFlags.AUDIT_IMPORTS in self.flags:
+            ImportAudit.stop()
+            for line in ImportAudit.format_report().splitlines():
+                LOG_INFO("{}", line)
+        
+        #warm the apps this user usually opens at this hour once the desktop goes idle
+        if SystemFlags.NO_PREWARM not in self.flags:
+            AppPrewarmer().start(parent=self.desktop)
+    
     def change_wallpaper(self, new_wp_path):
         if not hasattr(self, 'main_window') or not self.main_window:
             LOG_ERROR("Main window not available")
             return False
         
-        QApplication.processEvents()
-        
+        #decoding happens in the background; the current wallpaper stays until the new one is ready
         success = self.main_window.change_wallpaper(new_wp_path)
         
         if success:
-            LOG_INFO("Wallpaper changed successfully to: {}", new_wp_path)
-            self.main_window.repaint()
-            QApplication.processEvents()
+            LOG_INFO("Wallpaper change requested: {}", new_wp_path)
         else:
             LOG_ERROR("Failed to change wallpaper to: {}", new_wp_path)
         
         return success
     
     def shutdown_system(self):
+        self.screen_changed.emit("shutdown")
+        
         if SystemFlags.SKIP_SHUTDOWN_SCREEN in self.flags:
             self._cleanup_widgets()
             QApplication.quit()
@@ -146,7 +276,9 @@ class LSystem013(QObject):
         self.apps_manager = AppsManager()
              
     def starting_system(self):
+        BootProfiler.end("splash")
         self.load_applications()
+        self.prefetch_desktop()
         
         if SystemFlags.SKIP_LOGIN_SCREEN in self.flags:
             self.show_desktop("developer")
@@ -159,4 +291,6 @@ class LSystem013(QObject):
             self.login.request_shutdown.connect(self.shutdown_system)
             self.main_window.setCentralWidget(self.login)
             self.login.login_success.connect(self.show_desktop)
-            self.login.show()
\ No newline at end of file
+            self.login.show()
+            BootProfiler.begin("login")
+            self.screen_changed.emit("login")
\ No newline at end of file
@@ -1,12 +1,16 @@
 import platform
-import psutil
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
-                              QProgressBar, QGroupBox, QGridLayout)
+                              QProgressBar, QGroupBox, QGridLayout,
+                              QTableWidget, QTableWidgetItem, QHeaderView)
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon
 
 from api.application import Application
 from system.core.constants import *
+from system.core.lazy_import import lazy_import
+from system.core.apps_manager import AppsManager
+
+psutil = lazy_import("psutil")
 
 class SystemApp(Application):
     def __init__(self, parent=None):
@@ -97,6 +101,22 @@ class SystemApp(Application):
         net_group.setLayout(net_layout)
         main_layout.addWidget(net_group)
         
+        apps_group = QGroupBox("Aplicativos")
+        apps_layout = QVBoxLayout()
+        
+        self.apps_table = QTableWidget(0, 8)
+        self.apps_table.setHorizontalHeaderLabels([
+            "Aplicativo", "Aberturas", "Abertos", "Import (ms)",
+            "Construção (ms)", "1ª pintura (ms)", "CPU (s)", "Memória pico (MB)"
+        ])
+        self.apps_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.apps_table.verticalHeader().setVisible(False)
+        self.apps_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        apps_layout.addWidget(self.apps_table)
+        
+        apps_group.setLayout(apps_layout)
+        main_layout.addWidget(apps_group)
+        
         main_layout.addStretch()
     
     def update_info(self):
@@ -150,6 +170,29 @@ class SystemApp(Application):
                     net_status = f"Conectado ({interface})"
         
         self.net_label.setText(f"Status: {net_status}")
+        
+        self.update_apps_metrics()
+    
+    def update_apps_metrics(self):
+        def ms(value):
+            return f"{value:.1f}" if value is not None else "-"
+        
+        all_metrics = AppsManager().get_all_app_metrics()
+        self.apps_table.setRowCount(len(all_metrics))
+        
+        for row, metrics in enumerate(all_metrics.values()):
+            values = [
+                metrics["name"],
+                str(metrics["launches"]),
+                str(metrics["running"]),
+                ms(metrics["avg_import_ms"]),
+                ms(metrics["avg_construct_ms"]),
+                ms(metrics["avg_first_paint_ms"]),
+                f"{metrics['total_cpu_time_s']:.2f}",
+                f"{metrics['peak_memory_bytes'] / 1024**2:.1f}"
+            ]
+            for column, value in enumerate(values):
+                self.apps_table.setItem(row, column, QTableWidgetItem(value))
     
     def create_actions(self):
         refresh_action = QAction("Atualizar Agora", self)
@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import QMainWindow, QApplication
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 from enum import Enum
+import os
 
 from .log import *
 from system.ui.wallpaper import Wallpaper
+from system.ui.wallpaper_loader import WallpaperLoader
 
 class WindowMode(Enum):
     WINDOWED = 0
@@ -12,6 +14,9 @@ class WindowMode(Enum):
     FULLSCREEN = 3
 
 class SystemMainWindow(QMainWindow):
+    wallpaper_changed = Signal(str)
+    wallpaper_failed = Signal(str)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("LSystem 013")
@@ -19,6 +24,11 @@ class SystemMainWindow(QMainWindow):
         self.setStyleSheet("background-color: black;")
 
         self.wallpaper = None
+        self.wallpaper_hidden = False
+        
+        self.wallpaper_loader = WallpaperLoader(self)
+        self.wallpaper_loader.loaded.connect(self._swap_wallpaper)
+        self.wallpaper_loader.failed.connect(self._on_wallpaper_failed)
 
         screen = QApplication.primaryScreen().geometry()
         self.setGeometry(0, 0, screen.width(), screen.height())
@@ -26,56 +36,54 @@ class SystemMainWindow(QMainWindow):
         LOG_INFO("Window size: {}x{}", self.width(), self.height())
     
     def set_wallpaper(self, wp_path):
-        try:
-            self.wallpaper = Wallpaper(wp_path, parent=self)
-            self.wallpaper.lower()
-        except Exception as e:
-            LOG_FATAL("Failed to initialize wallpaper: {}", e)
-
-        LOG_INFO("Wallpaper size: {}x{}", 
-          self.wallpaper.width(),
-          self.wallpaper.height())
+        if not self.change_wallpaper(wp_path):
+            LOG_FATAL("Failed to initialize wallpaper: {}", wp_path)
     
     def change_wallpaper(self, new_wp_path):
-        """Altera o wallpaper em tempo de execução"""
+        """Altera o wallpaper em tempo de execução; o atual continua visível até o novo estar pronto"""
+        if not os.path.exists(new_wp_path):
+            LOG_ERROR("Wallpaper not found in path: {}", new_wp_path)
+            return False
+        
+        self.wallpaper_loader.request(new_wp_path, self.width(), self.height(), self.devicePixelRatioF())
+        return True
+    
+    def _swap_wallpaper(self, wp_path, pixmap):
         try:
-            if self.wallpaper:
-                self.wallpaper.hide()
-            
-            new_wallpaper = Wallpaper(new_wp_path, parent=self)
-            new_wallpaper.lower()
-            
-            if hasattr(self, 'wallpaper') and self.wallpaper:
-                self.wallpaper.setParent(None)
-                self.wallpaper.deleteLater()
-            
-            self.wallpaper = new_wallpaper
-            
-            self.wallpaper.update_wallpaper(self.width(), self.height())
-            self.wallpaper.setGeometry(0, 0, self.width(), self.height())
-            self.wallpaper.show()
-            self.wallpaper.lower()
-            
-            LOG_INFO("Wallpaper changed to: {}", new_wp_path)
-            return True
-            
+            new_wallpaper = Wallpaper(wp_path, parent=self, pixmap=pixmap, loader=self.wallpaper_loader)
         except Exception as e:
-            LOG_ERROR("Failed to change wallpaper: {}", e)
-            if hasattr(self, 'wallpaper') and self.wallpaper:
-                self.wallpaper.show()
-            return False
+            self._on_wallpaper_failed(wp_path, e)
+            return
+        
+        if self.wallpaper:
+            self.wallpaper.setParent(None)
+            self.wallpaper.deleteLater()
+        
+        self.wallpaper = new_wallpaper
+        self.wallpaper.setGeometry(0, 0, self.width(), self.height())
+        self.wallpaper.setVisible(not self.wallpaper_hidden)
+        self.wallpaper.lower()
+        
+        LOG_INFO("Wallpaper changed to: {} ({}x{})", wp_path, self.wallpaper.width(), self.wallpaper.height())
+        self.wallpaper_changed.emit(wp_path)
+    
+    def _on_wallpaper_failed(self, wp_path, error=None):
+        LOG_ERROR("Failed to change wallpaper: {}", error or wp_path)
+        self.wallpaper_failed.emit(wp_path)
             
     def hide_wallpaper(self):
+        self.wallpaper_hidden = True
         if self.wallpaper:
             self.wallpaper.hide()
         else:
-            LOG_WARN("No wallpaper loaded to hide")
+            LOG_TRACE("No wallpaper loaded yet, it will start hidden")
 
     def show_wallpaper(self):
+        self.wallpaper_hidden = False
         if self.wallpaper:
             self.wallpaper.show()
         else:
-            LOG_WARN("No wallpaper loaded to show")
+            LOG_TRACE("No wallpaper loaded yet, it will start visible")
 
     def remove_wallpaper(self):
         if self.wallpaper:
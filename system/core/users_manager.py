@@ -1,30 +1,118 @@
 import os
 import json
+import time
 from enum import Enum
 import uuid
-import bcrypt
-from typing import Optional, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
 
 from . import constants as CONSTS
 from .log import *
+from .lazy_import import lazy_import
+from .fileio import atomic_write_json
+from .users_store import UsersStore, create_users_store
+
+bcrypt = lazy_import("bcrypt")
 
 class UserPrivilege(Enum):
     DEVELOPER = "developer"
     ADMIN = "admin"
     GUEST = "guest"
 
+class PasswordPolicy:
+    """Custo (rounds) do bcrypt usado nas senhas; cada round a mais dobra o tempo de verificação."""
+
+    def __init__(self, rounds: int = CONSTS.BCRYPT_DEFAULT_ROUNDS):
+        if not CONSTS.BCRYPT_MIN_ROUNDS <= rounds <= CONSTS.BCRYPT_MAX_ROUNDS:
+            raise ValueError(f"bcrypt rounds must be between {CONSTS.BCRYPT_MIN_ROUNDS} and {CONSTS.BCRYPT_MAX_ROUNDS}, got {rounds}")
+        self.rounds = rounds
+    
+    def hash_password(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    
+    @staticmethod
+    def rounds_of(password_hash: str) -> Optional[int]:
+        #bcrypt hashes look like $2b$12$<salt+hash>
+        parts = password_hash.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+    
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self.rounds_of(password_hash) != self.rounds
+    
+    @staticmethod
+    def measure_verify_ms(rounds: int, samples: int = 3) -> float:
+        password = b"calibration"
+        password_hash = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            bcrypt.checkpw(password, password_hash)
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
+    
+    @staticmethod
+    def calibrate(target_ms: float = CONSTS.BCRYPT_TARGET_VERIFY_MS) -> "PasswordPolicy":
+        """Escolhe o maior custo cuja verificação fica dentro de target_ms nesta máquina."""
+        #measure a cheap cost and extrapolate, since each extra round doubles the time
+        base_rounds = 8
+        base_ms = max(PasswordPolicy.measure_verify_ms(base_rounds), 0.01)
+        
+        rounds = CONSTS.BCRYPT_MIN_ROUNDS
+        for candidate in range(CONSTS.BCRYPT_MIN_ROUNDS, CONSTS.BCRYPT_MAX_ROUNDS + 1):
+            if base_ms * 2 ** (candidate - base_rounds) <= target_ms:
+                rounds = candidate
+        
+        #confirm the pick with a real measurement, the extrapolation ignores fixed overhead
+        while rounds > CONSTS.BCRYPT_MIN_ROUNDS and PasswordPolicy.measure_verify_ms(rounds, samples=1) > target_ms:
+            rounds -= 1
+        
+        LOG_INFO("Calibrated bcrypt cost: {} rounds for a {:.0f} ms target", rounds, target_ms)
+        return PasswordPolicy(rounds)
+    
+    def to_json(self) -> Dict:
+        return {"rounds": self.rounds}
+    
+    @staticmethod
+    def from_json(data: Dict) -> "PasswordPolicy":
+        return PasswordPolicy(int(data.get("rounds", CONSTS.BCRYPT_DEFAULT_ROUNDS)))
+
+def _hash_with_rounds(job: Tuple[str, int]) -> str:
+    #runs in worker processes, so it has to be a picklable module-level function
+    password, rounds = job
+    return PasswordPolicy(rounds).hash_password(password)
+
+@dataclass
+class ProvisionReport:
+    created: List[str] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    hash_seconds: float = 0.0
+    total_seconds: float = 0.0
+    
+    @property
+    def users_per_second(self) -> float:
+        return len(self.created) / self.total_seconds if self.total_seconds > 0 else 0.0
+    
+    def __str__(self):
+        return (f"{len(self.created)} users created, {len(self.failures)} failed in {self.total_seconds:.2f} s "
+                f"(hashing {self.hash_seconds:.2f} s, {self.users_per_second:.1f} users/s)")
+
 class User:
-    def __init__(self, username, password, privilege: UserPrivilege = UserPrivilege.GUEST):
+    def __init__(self, username, password, privilege: UserPrivilege = UserPrivilege.GUEST,
+                 policy: Optional[PasswordPolicy] = None, password_hash: Optional[str] = None):
         self.user_id = str(uuid.uuid4())
         self.username = username
-        self.password = self._hash_password(password)
+        self.password = password_hash or self._hash_password(password, policy)
         self.user_path_root = os.path.join(CONSTS.USERS_PATH, username)
         self.privilege = privilege
     
     @staticmethod
-    def _hash_password(password):
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    def _hash_password(password, policy: Optional[PasswordPolicy] = None):
+        return (policy or PasswordPolicy()).hash_password(password)
     
     def verify_password(self, password):
         return bcrypt.checkpw(password.encode('utf-8'), self.password.encode('utf-8'))
@@ -52,55 +140,107 @@ class UsersManager:
             return
         self.__initialized = True
         
-        self.users: List[Dict] = []
-        self.users_data_file = CONSTS.USERS_DATA_FILENAME
+        self.policy_file = CONSTS.PASSWORD_POLICY_FILENAME
         
         os.makedirs(CONSTS.USERS_PATH, exist_ok=True)
-        
-        if not os.path.exists(self.users_data_file):
-            with open(self.users_data_file, "w", encoding="utf-8") as f:
-                json.dump([], f, indent=4)
-            LOG_INFO("Users data file was created")
-        else:
-            self._load_users()
+        self.password_policy = self._load_password_policy()
+        self.store: UsersStore = create_users_store()
+    
+    @property
+    def users(self) -> List[Dict]:
+        return self.store.all()
     
-    def _load_users(self):
+    def _load_password_policy(self) -> PasswordPolicy:
+        if not os.path.exists(self.policy_file):
+            return PasswordPolicy()
         try:
-            with open(self.users_data_file, "r", encoding="utf-8") as f:
-                self.users = json.load(f)
-                if not isinstance(self.users, list):
-                    self.users = []
-                LOG_INFO(f"Loaded {len(self.users)} users")
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            LOG_ERROR(f"Error loading users: {e}")
-            self.users = []
-
-    def _save_users(self):
+            with open(self.policy_file, "r", encoding="utf-8") as f:
+                return PasswordPolicy.from_json(json.load(f))
+        except (json.JSONDecodeError, ValueError, OSError) as e:
+            LOG_ERROR(f"Invalid password policy, using defaults: {e}")
+            return PasswordPolicy()
+    
+    def set_password_policy(self, policy: PasswordPolicy, persist: bool = True) -> bool:
+        """Troca o custo usado em senhas novas; as existentes são refeitas no próximo login."""
+        self.password_policy = policy
+        if not persist:
+            return True
         try:
-            with open(self.users_data_file, "w", encoding="utf-8") as f:
-                json.dump(self.users, f, indent=4)
+            atomic_write_json(self.policy_file, policy.to_json(), indent=4)
+            LOG_INFO(f"Password policy set to {policy.rounds} bcrypt rounds")
             return True
         except Exception as e:
-            LOG_ERROR(f"Error saving users: {e}")
+            LOG_ERROR(f"Error saving password policy: {e}")
             return False
     
+    def calibrate_password_policy(self, target_ms: float = CONSTS.BCRYPT_TARGET_VERIFY_MS) -> PasswordPolicy:
+        policy = PasswordPolicy.calibrate(target_ms)
+        self.set_password_policy(policy)
+        return policy
+    
     def create_user(self, username, password, privilege: UserPrivilege = UserPrivilege.GUEST):
-        if any(user['username'] == username for user in self.users):
+        if self.store.get_by_username(username) is not None:
             LOG_WARN(f"User '{username}' already exists")
             return False
 
-        user = User(username, password, privilege)
-        self.users.append(user.to_json())
+        user = User(username, password, privilege, self.password_policy)
         
-        if self._save_users():
+        if self.store.put(user.to_json()):
             LOG_INFO(f"User '{username}' created successfully")
             return True
         
         LOG_ERROR(f"Error creating user '{username}'")
         return False
 
+    def create_users(self, records: List[Dict], max_workers: Optional[int] = None) -> ProvisionReport:
+        """Cria vários usuários de uma vez: hashes em paralelo em processos e uma única escrita no armazenamento.
+        Cada registro tem 'username', 'password' e opcionalmente 'privilege'."""
+        report = ProvisionReport()
+        start = time.perf_counter()
+        
+        accepted = []
+        seen = set()
+        for record in records:
+            username = (record.get('username') or "").strip()
+            password = record.get('password') or ""
+            
+            if not username or not password:
+                report.failures.append((username or "<empty>", "missing username or password"))
+                continue
+            if username in seen or self.store.get_by_username(username) is not None:
+                report.failures.append((username, "user already exists"))
+                continue
+            try:
+                privilege = UserPrivilege(record.get('privilege') or UserPrivilege.GUEST.value)
+            except ValueError:
+                report.failures.append((username, f"invalid privilege '{record.get('privilege')}'"))
+                continue
+            
+            seen.add(username)
+            accepted.append((username, password, privilege))
+        
+        if accepted:
+            hash_start = time.perf_counter()
+            jobs = [(password, self.password_policy.rounds) for _, password, _ in accepted]
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                hashes = list(executor.map(_hash_with_rounds, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+            report.hash_seconds = time.perf_counter() - hash_start
+            
+            users = [User(username, None, privilege, password_hash=password_hash).to_json()
+                     for (username, _, privilege), password_hash in zip(accepted, hashes)]
+            
+            if self.store.put_many(users):
+                report.created = [user['username'] for user in users]
+            else:
+                report.failures.extend((user['username'], "storage write failed") for user in users)
+        
+        report.total_seconds = time.perf_counter() - start
+        LOG_INFO(f"Bulk provisioning: {report}")
+        return report
+
     def authenticate_user(self, username, password):
-        user_data = next((user for user in self.users if user['username'] == username), None)
+        user_data = self.store.get_by_username(username)
         
         if user_data is None:
             LOG_WARN(f"User '{username}' not found")
@@ -110,17 +250,28 @@ class UsersManager:
             LOG_WARN(f"Invalid password for user '{username}'")
             return None
         
+        if self.password_policy.needs_rehash(user_data['password']):
+            user_data = self._rehash_password(user_data, password)
+        
         LOG_INFO(f"User '{username}' authenticated successfully")
         return user_data
+    
+    def _rehash_password(self, user_data, password):
+        old_rounds = PasswordPolicy.rounds_of(user_data['password'])
+        new_hash = self.password_policy.hash_password(password)
+        
+        updated = dict(user_data, password=new_hash)
+        if not self.store.put(updated):
+            return user_data
+        
+        LOG_INFO(f"Rehashed password of '{user_data['username']}' from {old_rounds} to {self.password_policy.rounds} rounds")
+        return updated
 
     def remove_user(self, user_id_or_username):
-        initial_count = len(self.users)
-        self.users = [user for user in self.users 
-                     if user['id'] != user_id_or_username 
-                     and user['username'] != user_id_or_username]
+        user_data = self.get_user(user_id_or_username)
         
-        if len(self.users) < initial_count:
-            if self._save_users():
+        if user_data is not None:
+            if self.store.remove(user_data['id']):
                 LOG_INFO(f"User '{user_id_or_username}' removed successfully")
                 return True
         
@@ -128,9 +279,7 @@ class UsersManager:
         return False
 
     def get_users(self):
-        return self.users.copy()
+        return self.users
 
     def get_user(self, user_id_or_username):
-        return next((user for user in self.users 
-                    if user['id'] == user_id_or_username 
-                    or user['username'] == user_id_or_username), None)
\ No newline at end of file
+        return self.store.get_by_id(user_id_or_username) or self.store.get_by_username(user_id_or_username)
\ No newline at end of file
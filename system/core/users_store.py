@@ -0,0 +1,274 @@
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from . import constants as CONSTS
+from .log import *
+from .fileio import atomic_write_json, append_json_lines, read_json_lines
+
+class UsersStore(ABC):
+    """Interface de armazenamento de usuários usada pelo UsersManager; os registros são dicts no formato de User.to_json()."""
+
+    @abstractmethod
+    def get_by_id(self, user_id: str) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    def get_by_username(self, username: str) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    def all(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def put_many(self, users: List[Dict]) -> bool:
+        pass
+
+    @abstractmethod
+    def remove(self, user_id: str) -> bool:
+        pass
+
+    def put(self, user_data: Dict) -> bool:
+        return self.put_many([user_data])
+
+    def close(self) -> None:
+        pass
+
+class JsonUsersStore(UsersStore):
+    """users.json como snapshot mais um journal de mudanças, indexados em memória por id e por nome."""
+
+    def __init__(self, data_file=CONSTS.USERS_DATA_FILENAME, journal_file=CONSTS.USERS_JOURNAL_FILENAME,
+                 compact_threshold=CONSTS.USERS_JOURNAL_COMPACT_THRESHOLD):
+        #both indexes point to the same dicts; the id index keeps insertion order for saving
+        self.users_by_id: Dict[str, Dict] = {}
+        self.users_by_username: Dict[str, Dict] = {}
+        self.data_file = data_file
+        self.journal_file = journal_file
+        self.compact_threshold = compact_threshold
+        self.journal_entries = 0
+        self._lock = threading.RLock()
+
+        if not os.path.exists(self.data_file):
+            atomic_write_json(self.data_file, [], indent=4)
+            LOG_INFO("Users data file was created")
+        else:
+            self._load_snapshot()
+
+        #a torn line is rewritten away at once, so later appends never land next to it
+        invalid = self._replay_journal()
+        if invalid or self.journal_entries >= self.compact_threshold:
+            self.compact()
+
+    def get_by_id(self, user_id):
+        return self.users_by_id.get(user_id)
+
+    def get_by_username(self, username):
+        return self.users_by_username.get(username)
+
+    def all(self):
+        return list(self.users_by_id.values())
+
+    def count(self):
+        return len(self.users_by_id)
+
+    def put_many(self, users):
+        return self._record_changes([{"op": "put", "user": user_data} for user_data in users])
+
+    def remove(self, user_id):
+        return self._record_changes([{"op": "remove", "id": user_id}])
+
+    def _index_user(self, user_data: Dict) -> None:
+        self.users_by_id[user_data['id']] = user_data
+        self.users_by_username[user_data['username']] = user_data
+
+    def _unindex_user(self, user_data: Dict) -> None:
+        self.users_by_id.pop(user_data['id'], None)
+        self.users_by_username.pop(user_data['username'], None)
+
+    def _load_snapshot(self):
+        try:
+            with open(self.data_file, "r", encoding="utf-8") as f:
+                users = json.load(f)
+            if not isinstance(users, list):
+                users = []
+            for user_data in users:
+                self._index_user(user_data)
+            LOG_INFO(f"Loaded {len(self.users_by_id)} users")
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            LOG_ERROR(f"Error loading users: {e}")
+
+    def _apply_change(self, change: Dict) -> None:
+        #replaying the same change twice leaves the same state, so a crash during compaction is harmless
+        if change.get('op') == "put":
+            user_data = change['user']
+            previous = self.users_by_id.get(user_data['id'])
+            if previous is not None:
+                self._unindex_user(previous)
+            self._index_user(user_data)
+        elif change.get('op') == "remove":
+            previous = self.users_by_id.get(change['id'])
+            if previous is not None:
+                self._unindex_user(previous)
+
+    def _replay_journal(self):
+        changes, invalid = read_json_lines(self.journal_file)
+        if invalid:
+            LOG_WARN(f"Skipped {invalid} corrupt entries in users journal")
+
+        for change in changes:
+            self._apply_change(change)
+        self.journal_entries = len(changes)
+
+        if changes:
+            LOG_INFO(f"Replayed {len(changes)} users journal entries")
+        return invalid
+
+    def _record_changes(self, changes: List[Dict]) -> bool:
+        """Acrescenta as mudanças ao journal e só então as aplica em memória; o snapshot só é refeito na compactação."""
+        with self._lock:
+            #a change that did not reach the disk must not be visible (a user that can log in until restart)
+            try:
+                append_json_lines(self.journal_file, changes)
+            except Exception as e:
+                LOG_ERROR(f"Error writing users journal: {e}")
+                return False
+
+            for change in changes:
+                self._apply_change(change)
+            self.journal_entries += len(changes)
+            if self.journal_entries >= self.compact_threshold:
+                self.compact()
+            return True
+
+    def compact(self) -> bool:
+        """Grava o snapshot completo de forma atômica e só então esvazia o journal."""
+        try:
+            with self._lock:
+                atomic_write_json(self.data_file, self.all(), indent=4)
+                open(self.journal_file, "w", encoding="utf-8").close()
+                self.journal_entries = 0
+            LOG_TRACE("Users snapshot compacted")
+            return True
+        except Exception as e:
+            LOG_ERROR(f"Error saving users: {e}")
+            return False
+
+class SqliteUsersStore(UsersStore):
+    """Usuários em um banco SQLite (modo WAL), com id e nome indexados; nada é carregado inteiro na memória."""
+    COLUMNS = ("id", "username", "password", "path_root", "privilege")
+
+    def __init__(self, db_file=CONSTS.USERS_DB_FILENAME, legacy_file=CONSTS.USERS_DATA_FILENAME,
+                 legacy_journal_file=CONSTS.USERS_JOURNAL_FILENAME):
+        self.db_file = db_file
+        #authentication runs on worker threads, so the connection is shared behind a lock
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+
+        with self._lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    path_root TEXT,
+                    privilege TEXT NOT NULL
+                )
+            """)
+            self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_id ON users(id)")
+            self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username)")
+
+        self._migrate_from_json(legacy_file, legacy_journal_file)
+        LOG_INFO(f"Opened users database with {self.count()} users")
+
+    def _migrate_from_json(self, legacy_file, legacy_journal_file):
+        if not os.path.exists(legacy_file) or self.count() > 0:
+            return
+
+        legacy = JsonUsersStore(legacy_file, legacy_journal_file)
+        users = legacy.all()
+        if not self.put_many(users):
+            LOG_ERROR("Users migration to SQLite failed, keeping the JSON store untouched")
+            return
+
+        #renaming makes the migration one-shot while keeping the original data around
+        os.replace(legacy_file, f"{legacy_file}.migrated")
+        if os.path.exists(legacy_journal_file):
+            os.replace(legacy_journal_file, f"{legacy_journal_file}.migrated")
+        LOG_INFO(f"Migrated {len(users)} users from {os.path.basename(legacy_file)} to SQLite")
+
+    def _row_to_user(self, row) -> Optional[Dict]:
+        if row is None:
+            return None
+        return {column: row[column] for column in self.COLUMNS}
+
+    def _fetch_one(self, where, value):
+        with self._lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM users WHERE {where} = ?", (value,)
+            ).fetchone()
+        return self._row_to_user(row)
+
+    def get_by_id(self, user_id):
+        return self._fetch_one("id", user_id)
+
+    def get_by_username(self, username):
+        return self._fetch_one("username", username)
+
+    def all(self):
+        with self._lock:
+            rows = self.connection.execute(f"SELECT {', '.join(self.COLUMNS)} FROM users ORDER BY seq").fetchall()
+        return [self._row_to_user(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def put_many(self, users):
+        rows = [tuple(user_data.get(column) for column in self.COLUMNS) for user_data in users]
+        try:
+            with self._lock, self.connection:
+                self.connection.executemany(f"""
+                    INSERT INTO users ({', '.join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        username = excluded.username,
+                        password = excluded.password,
+                        path_root = excluded.path_root,
+                        privilege = excluded.privilege
+                """, rows)
+            return True
+        except sqlite3.Error as e:
+            LOG_ERROR(f"Error saving users: {e}")
+            return False
+
+    def remove(self, user_id):
+        try:
+            with self._lock, self.connection:
+                self.connection.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            return True
+        except sqlite3.Error as e:
+            LOG_ERROR(f"Error removing user: {e}")
+            return False
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+def create_users_store(backend: Optional[str] = None) -> UsersStore:
+    backend = backend or CONSTS.USERS_STORAGE_BACKEND
+    if backend == "sqlite":
+        return SqliteUsersStore()
+    if backend == "json":
+        return JsonUsersStore()
+    raise ValueError(f"Unknown users storage backend: {backend}")
\ No newline at end of file
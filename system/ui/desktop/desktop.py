@@ -7,19 +7,25 @@ import importlib
 from system.core.constants import *
 from system.core.log import *
 from system.ui.wallpaper import Wallpaper
-from system.ui.wallpaper_selector import WallpaperSelector
 from system.ui.desktop.taskbar import Taskbar
 from system.ui.desktop.start_menu import StartMenu
-from system.ui.desktop.context_menu import ContextMenu
 from system.core.apps_manager import AppsManager
+from system.core.app_launcher import AppLauncher
+from system.core.lazy_import import lazy_import
+
+#only needed once the user opens them
+WallpaperSelector = lazy_import("system.ui.wallpaper_selector", "WallpaperSelector")
+ContextMenu = lazy_import("system.ui.desktop.context_menu", "ContextMenu")
 
 class Desktop(QWidget):
     wallpaper_change_requested = Signal(str)
+    first_painted = Signal()
     
     def __init__(self, username, system):
         super().__init__()
         self.username = username
         self.system = system
+        self._painted = False
         self.main_window = self.system.main_window
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -52,6 +58,12 @@ class Desktop(QWidget):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+    
     def connect_shutdown_signal(self, start_menu):
         start_menu.request_shutdown.connect(self.handle_shutdown)
     
@@ -74,43 +86,10 @@ class Desktop(QWidget):
     
     def launch_application(self, app_id: str):
         try:
-            from system.core.apps_manager import AppsManager
-            import importlib.util
-            from pathlib import Path
-
-            manager = AppsManager()
-            app = manager.get_app(app_id)
-            
-            module_path = Path(ROOT_PATH) / f"{app.manifest.package.replace('.', '/')}.py"
-            
-            spec = importlib.util.spec_from_file_location(
-                app.manifest.package,
-                str(module_path)
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            if hasattr(module, 'create_app_instance'):
-                app_instance = module.create_app_instance(parent=self)
-            else:
-                app_class = getattr(module, app.manifest.main_class)
-                app_instance = app_class(parent=self)
-
-            if not app_instance:
-                raise RuntimeError("Instância do aplicativo não foi criada")
-
-            if isinstance(app_instance, QMainWindow):
-                app_instance.setWindowFlags(
-                    Qt.Window | 
-                    Qt.WindowCloseButtonHint |
-                    Qt.WindowMinimizeButtonHint |
-                    Qt.WindowMaximizeButtonHint
-                )
-                app_instance.setWindowModality(Qt.NonModal)
-                
-            app_instance.show()
-            app_instance.raise_()
-            app_instance.activateWindow()
+            app = AppsManager().get_app(app_id)
+            success, message = AppLauncher.launch_app(app, parent=self)
+            if not success:
+                raise RuntimeError(message)
 
         except Exception as e:
             LOG_ERROR(f"Falha ao iniciar app {app_id}: {str(e)}")
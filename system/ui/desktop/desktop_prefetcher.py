@@ -0,0 +1,60 @@
+from PySide6.QtCore import QObject, Signal
+
+from system.core.constants import *
+from system.core.log import *
+from system.core.apps_manager import AppsManager
+from system.ui.icon_cache import IconCache
+
+START_MENU_ICONS = [APPS_ICON, DOCUMENT_ICON, CONFIG_ICON, POWER_ICON]
+
+class DesktopPrefetcher(QObject):
+    """Prepara os recursos do desktop (wallpaper e ícones) em segundo plano durante o login."""
+    ready = Signal()
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.pending = set()
+        self.started = False
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        self.pending = {"wallpaper", "icons"}
+
+        loader = self.main_window.wallpaper_loader
+        loader.prefetched.connect(self._on_wallpaper_prefetched)
+        loader.prefetch(
+            DEFAULT_DESKTOP_WALLPAPER_FILENAME,
+            self.main_window.width(),
+            self.main_window.height(),
+            self.main_window.devicePixelRatioF()
+        )
+
+        icon_paths = list(START_MENU_ICONS)
+        icon_paths.extend(app.icon_path for app in AppsManager().apps if app.has_icon())
+
+        icon_cache = IconCache()
+        icon_cache.preloaded.connect(self._on_icons_preloaded)
+        icon_cache.preload(icon_paths)
+
+        LOG_INFO("Prefetching desktop resources")
+
+    def is_ready(self):
+        return self.started and not self.pending
+
+    def _on_wallpaper_prefetched(self, wp_path, success):
+        if wp_path == DEFAULT_DESKTOP_WALLPAPER_FILENAME:
+            self.main_window.wallpaper_loader.prefetched.disconnect(self._on_wallpaper_prefetched)
+            self._mark_done("wallpaper")
+
+    def _on_icons_preloaded(self):
+        IconCache().preloaded.disconnect(self._on_icons_preloaded)
+        self._mark_done("icons")
+
+    def _mark_done(self, resource):
+        self.pending.discard(resource)
+        if not self.pending:
+            LOG_INFO("Desktop resources ready")
+            self.ready.emit()
@@ -6,6 +6,8 @@ from PySide6.QtGui import QColor, QBrush, QLinearGradient, QPainter, QIcon
 from system.core.constants import *
 from system.core.apps_manager import AppsManager
 from system.core.app import App 
+from system.ui.icon_cache import IconCache
+from system.core.app_dependencies import AppPreloader
 
 class StartMenu(QFrame):
     request_shutdown = Signal()
@@ -60,6 +62,11 @@ class StartMenu(QFrame):
         if event.type() == QEvent.WindowDeactivate:
             if self.isVisible():
                 QTimer.singleShot(100, self.check_focus)
+        elif event.type() == QEvent.Enter and obj.property("app_id"):
+            #the pointer is on an app: import it and its dependencies before the click arrives
+            app = AppsManager().apps_by_id.get(obj.property("app_id"))
+            if app is not None:
+                AppPreloader().preload(app)
         return super().eventFilter(obj, event)
 
     def check_focus(self):
@@ -109,7 +116,7 @@ class StartMenu(QFrame):
         
         for text, icon_path, callback in menu_buttons:
             btn = QPushButton(text)
-            btn.setIcon(QIcon(icon_path))
+            btn.setIcon(IconCache().icon(icon_path))
             btn.setIconSize(QSize(24, 24))
             
             btn.setStyleSheet("""
@@ -167,7 +174,7 @@ class StartMenu(QFrame):
             btn.setToolTip(app.manifest.description)
             
             if app.has_icon():
-                btn.setIcon(QIcon(app.icon_path))
+                btn.setIcon(IconCache().icon(app.icon_path))
                 btn.setIconSize(QSize(20, 20))
             
             btn.setStyleSheet("""
@@ -191,6 +198,8 @@ class StartMenu(QFrame):
             """)
             
             btn.clicked.connect(lambda _, app_id=app.app_id: self.open_application(app_id))
+            btn.setProperty("app_id", app.app_id)
+            btn.installEventFilter(self)
             self.programs_container.layout().addWidget(btn)
     
     def open_application(self, app_id: str):
@@ -0,0 +1,76 @@
+import os
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QIcon, QImage, QPixmap
+
+from system.core.log import *
+
+class _IconSignals(QObject):
+    decoded = Signal(str, QImage)
+    finished = Signal()
+
+class _IconPreloadTask(QRunnable):
+    def __init__(self, paths, signals):
+        super().__init__()
+        self.paths = paths
+        self.signals = signals
+
+    def run(self):
+        for path in self.paths:
+            image = QImage(path)
+            if image.isNull():
+                LOG_WARN("Failed to preload icon: {}", path)
+                continue
+            self.signals.decoded.emit(path, image)
+        self.signals.finished.emit()
+
+class IconCache(QObject):
+    """Ícones compartilhados; preload() decodifica os arquivos fora da thread da GUI."""
+    preloaded = Signal()
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self.__initialized:
+            return
+        self.__initialized = True
+        super().__init__()
+
+        self.icons = {}
+        self.pending_preloads = 0
+
+        self.signals = _IconSignals(self)
+        self.signals.decoded.connect(self._on_decoded)
+        self.signals.finished.connect(self._on_preload_finished)
+
+    def icon(self, path):
+        key = os.path.abspath(path)
+        icon = self.icons.get(key)
+        if icon is None:
+            icon = QIcon(path)
+            self.icons[key] = icon
+        return icon
+
+    def preload(self, paths):
+        paths = [p for p in paths if p and os.path.abspath(p) not in self.icons]
+        if not paths:
+            self.preloaded.emit()
+            return
+
+        self.pending_preloads += 1
+        QThreadPool.globalInstance().start(_IconPreloadTask(paths, self.signals))
+
+    def is_preloading(self):
+        return self.pending_preloads > 0
+
+    def _on_decoded(self, path, image):
+        self.icons[os.path.abspath(path)] = QIcon(QPixmap.fromImage(image))
+
+    def _on_preload_finished(self):
+        self.pending_preloads -= 1
+        if self.pending_preloads == 0:
+            self.preloaded.emit()
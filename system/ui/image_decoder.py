@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QImage, QImageReader
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+#libjpeg can only decode at these fractions of the original size
+JPEG_SCALE_DENOMINATORS = (8, 4, 2, 1)
+
+@dataclass
+class DecodeStats:
+    path: str
+    reduced: bool
+    elapsed_ms: float
+    source_size: Tuple[int, int]
+    decoded_size: Tuple[int, int]
+    decoded_bytes: int
+    result_bytes: int
+
+    def __str__(self) -> str:
+        mode = "reduced" if self.reduced else "full"
+        return (f"{os.path.basename(self.path)} [{mode}] {self.elapsed_ms:.1f} ms, "
+                f"decoded {self.decoded_size[0]}x{self.decoded_size[1]} "
+                f"({self.decoded_bytes / 1024 ** 2:.2f} MB)")
+
+def _reduced_decode_size(reader: QImageReader, source: QSize, target: QSize) -> QSize:
+    if reader.format().data().lower() not in (b"jpg", b"jpeg"):
+        return QSize()
+
+    for denominator in JPEG_SCALE_DENOMINATORS:
+        size = QSize(source.width() // denominator, source.height() // denominator)
+        if size.width() >= target.width() and size.height() >= target.height():
+            return size if denominator > 1 else QSize()
+    return QSize()
+
+def decode_scaled(path: str, width: int, height: int,
+                  aspect_mode=Qt.KeepAspectRatio, reduced: bool = True) -> Tuple[QImage, DecodeStats]:
+    """Decodifica uma imagem já no tamanho alvo; com reduced=True o JPEG é decodificado em escala reduzida."""
+    start = time.perf_counter()
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source = reader.size()
+
+    if source.isValid():
+        target = source.scaled(width, height, aspect_mode)
+        if reduced:
+            decode_size = _reduced_decode_size(reader, source, target)
+            if decode_size.isValid():
+                reader.setScaledSize(decode_size)
+    else:
+        target = QSize(width, height)
+
+    decoded = reader.read()
+    if decoded.isNull():
+        return QImage(), DecodeStats(path, reduced, (time.perf_counter() - start) * 1000,
+                                     (source.width(), source.height()), (0, 0), 0, 0)
+
+    if decoded.size() != target:
+        image = decoded.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    else:
+        image = decoded
+
+    stats = DecodeStats(
+        path=path,
+        reduced=reduced,
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+        source_size=(source.width(), source.height()),
+        decoded_size=(decoded.width(), decoded.height()),
+        decoded_bytes=decoded.sizeInBytes(),
+        result_bytes=image.sizeInBytes()
+    )
+    return image, stats
+
+def compare_decode_paths(directory: str, width: int, height: int) -> List[Tuple[DecodeStats, DecodeStats]]:
+    results = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+
+        path = os.path.join(directory, filename)
+        _, full = decode_scaled(path, width, height, reduced=False)
+        _, reduced = decode_scaled(path, width, height, reduced=True)
+        results.append((full, reduced))
+    return results
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication
+    from system.core.constants import WALLPAPERS_PATH
+
+    app = QGuiApplication(sys.argv)
+    directory = sys.argv[1] if len(sys.argv) > 1 else WALLPAPERS_PATH
+
+    total_full_ms = total_reduced_ms = 0.0
+    for full, reduced in compare_decode_paths(directory, 200, 150):
+        total_full_ms += full.elapsed_ms
+        total_reduced_ms += reduced.elapsed_ms
+        print(full)
+        print(reduced)
+
+    print(f"Total: full {total_full_ms:.1f} ms | reduced {total_reduced_ms:.1f} ms")
@@ -1,9 +1,34 @@
 from PySide6.QtWidgets import QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, QSizePolicy
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool
 from PySide6.QtWidgets import QApplication
 from PySide6.QtWidgets import QMessageBox
 
 from system.core.auth import Auth
+from system.core.log import *
+
+class _AuthSignals(QObject):
+    finished = Signal(str, bool)
+
+class _AuthTask(QRunnable):
+    def __init__(self, signals, username, password):
+        super().__init__()
+        self.signals = signals
+        self.username = username
+        self.password = password
+
+    def run(self):
+        #bcrypt is deliberately slow, so it must never run on the GUI thread
+        try:
+            success = Auth().authenticate_user(self.username, self.password)
+        except Exception as e:
+            LOG_ERROR("Authentication of {} failed with an error: {}", self.username, e)
+            success = False
+        
+        try:
+            self.signals.finished.emit(self.username, success)
+        except RuntimeError:
+            #the login screen was destroyed while authenticating
+            pass
 
 class LoginScreen(QWidget):
     login_success = Signal(str)
@@ -11,6 +36,12 @@ class LoginScreen(QWidget):
     
     def __init__(self):
         super().__init__()
+        self.authenticating = False
+        self.auth_pool = QThreadPool(self)
+        self.auth_pool.setMaxThreadCount(1)
+        self.auth_signals = _AuthSignals(self)
+        self.auth_signals.finished.connect(self._on_auth_finished)
+        
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
@@ -43,6 +74,7 @@ class LoginScreen(QWidget):
         self.login_button.setFixedHeight(50)
         self.login_button.clicked.connect(self.attempt_login)
         self.login_button.setEnabled(False)
+        self.password_input.returnPressed.connect(self.attempt_login)
         
         form_layout.addWidget(self.username_input)
         form_layout.addWidget(self.password_input)
@@ -89,12 +121,15 @@ class LoginScreen(QWidget):
         username = self.username_input.text()
         password = self.password_input.text()
         
-        if username and password:
+        if username and password and not self.authenticating:
             self.login_button.setEnabled(True)
         else:
             self.login_button.setEnabled(False)
     
     def attempt_login(self):
+        if self.authenticating:
+            return
+        
         username = self.username_input.text()
         password = self.password_input.text()
 
@@ -102,9 +137,24 @@ class LoginScreen(QWidget):
             QMessageBox.warning(self, "Campos Vazios", "Por favor, preencha todos os campos.")
             return
 
-        auth = Auth()
+        self.set_busy(True)
+        self.auth_pool.start(_AuthTask(self.auth_signals, username, password))
+    
+    def set_busy(self, busy):
+        self.authenticating = busy
+        self.username_input.setReadOnly(busy)
+        self.password_input.setReadOnly(busy)
+        self.login_button.setText("Entrando..." if busy else "Entrar")
+        
+        if busy:
+            self.login_button.setEnabled(False)
+        else:
+            self.validate_inputs()
+    
+    def _on_auth_finished(self, username, success):
+        self.set_busy(False)
         
-        if auth.authenticate_user(username, password):
+        if success:
             self.login_success.emit(username)
             self.close()
         else:
@@ -31,16 +31,20 @@ class SplashScreen(QWidget):
         progress_layout.addStretch()
         layout.addLayout(progress_layout)
 
+        self.status = QLabel()
+        self.status.setAlignment(Qt.AlignCenter)
+        self.status.setStyleSheet("font-size: 14px; color: rgba(255, 255, 255, 180);")
+        layout.addWidget(self.status)
+        
         self.load_progress = 0
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_progress)
-        self.timer.start(30)
     
-    def update_progress(self):
-        self.load_progress += 1
+    def update_progress(self, done, total, message=""):
+        self.load_progress = int(done * 100 / total) if total > 0 else 100
         self.progress.setValue(self.load_progress)
-        
-        if self.load_progress >= 100:
-            self.timer.stop()
-            self.finished.emit()
-            self.close()
\ No newline at end of file
+        self.status.setText(message)
+    
+    def finish(self):
+        self.load_progress = 100
+        self.progress.setValue(self.load_progress)
+        self.finished.emit()
+        self.close()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Optional
+
+from PySide6.QtCore import QMutex, QMutexLocker
+from PySide6.QtGui import QImage
+
+from system.core.constants import *
+from system.core.log import *
+from system.core.fileio import atomic_write_json
+
+class ThumbnailCache:
+    """Cache em disco de miniaturas, endereçado pelo conteúdo (caminho, mtime e tamanho)."""
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir: str = THUMBNAILS_CACHE_PATH, max_bytes: int = THUMBNAILS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(self.cache_dir, self.INDEX_FILENAME)
+        self.mutex = QMutex()
+
+        self.entries: Dict[str, Dict] = {}
+        self.total_bytes = 0
+        self._dirty = False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(source_path: str, width: int, height: int) -> Optional[str]:
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+
+        raw = f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _entry_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _load_index(self) -> None:
+        entries = {}
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            if not isinstance(entries, dict):
+                raise ValueError("expected dict")
+        except (json.JSONDecodeError, ValueError, OSError) as e:
+            LOG_WARN("Thumbnail cache index is invalid, discarding it: {}", e)
+            entries = {}
+            self._dirty = True
+
+        for key, entry in entries.items():
+            if os.path.exists(self._entry_file(key)):
+                self.entries[key] = entry
+                self.total_bytes += entry.get("bytes", 0)
+            else:
+                self._dirty = True
+
+        #thumbnails written without reaching the index (e.g. a crash) are orphans
+        for filename in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(filename)
+            if ext == ".png" and key not in self.entries:
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+
+    def get(self, source_path: str, width: int, height: int) -> Optional[QImage]:
+        key = self.make_key(source_path, width, height)
+        if key is None:
+            return None
+
+        with QMutexLocker(self.mutex):
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            self._dirty = True
+
+        image = QImage(self._entry_file(key))
+        if image.isNull():
+            with QMutexLocker(self.mutex):
+                self._remove_entry(key)
+            return None
+
+        return image
+
+    def put(self, source_path: str, width: int, height: int, image: QImage) -> bool:
+        key = self.make_key(source_path, width, height)
+        if key is None or image.isNull():
+            return False
+
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return False
+
+        entry_file = self._entry_file(key)
+        if not image.save(entry_file, "PNG"):
+            LOG_WARN("Failed to write thumbnail cache entry for: {}", source_path)
+            return False
+
+        source = os.path.abspath(source_path)
+        with QMutexLocker(self.mutex):
+            #older entries for the same file are stale now
+            for stale_key in [k for k, e in self.entries.items() if e["source"] == source and k != key]:
+                self._remove_entry(stale_key)
+
+            if key in self.entries:
+                self.total_bytes -= self.entries[key]["bytes"]
+
+            size = os.path.getsize(entry_file)
+            self.entries[key] = {
+                "source": source,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "bytes": size,
+                "last_access": time.time()
+            }
+            self.total_bytes += size
+            self._dirty = True
+            self._evict()
+
+        return True
+
+    def prune(self) -> int:
+        """Remove entradas de wallpapers apagados ou modificados."""
+        removed = 0
+        with QMutexLocker(self.mutex):
+            for key, entry in list(self.entries.items()):
+                if not self._is_current(entry):
+                    self._remove_entry(key)
+                    removed += 1
+
+        if removed:
+            LOG_INFO("Pruned {} thumbnail cache entries", removed)
+        return removed
+
+    @staticmethod
+    def _is_current(entry: Dict) -> bool:
+        try:
+            stat = os.stat(entry["source"])
+        except OSError:
+            return False
+        return stat.st_mtime_ns == entry.get("mtime_ns") and stat.st_size == entry.get("size")
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        by_age = sorted(self.entries.items(), key=lambda item: item[1]["last_access"])
+        for key, _ in by_age:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        self.total_bytes -= entry.get("bytes", 0)
+        self._dirty = True
+        try:
+            os.remove(self._entry_file(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with QMutexLocker(self.mutex):
+            for key in list(self.entries.keys()):
+                self._remove_entry(key)
+        self.flush()
+
+    def flush(self) -> None:
+        with QMutexLocker(self.mutex):
+            if not self._dirty:
+                return
+            entries = dict(self.entries)
+            self._dirty = False
+
+        try:
+            atomic_write_json(self.index_file, entries)
+        except OSError as e:
+            LOG_ERROR("Failed to save thumbnail cache index: {}", e)
@@ -1,34 +1,144 @@
 import os
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
+from collections import OrderedDict
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import QLabel
 
+from system.core.constants import WALLPAPER_CACHE_MAX_BYTES
 from system.core.log import *
 
+class ScaledWallpaperCache:
+    """Cache LRU de wallpapers já redimensionados, por (caminho, largura, altura, devicePixelRatio)."""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.entries = OrderedDict()
+            cls._instance.total_bytes = 0
+            cls._instance.max_bytes = WALLPAPER_CACHE_MAX_BYTES
+        return cls._instance
+
+    @staticmethod
+    def make_key(wp_path, width, height, dpr):
+        return (os.path.abspath(wp_path), width, height, round(dpr, 2))
+
+    def get(self, key):
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap):
+        if key in self.entries:
+            self.total_bytes -= self._pixmap_bytes(self.entries.pop(key))
+
+        self.entries[key] = pixmap
+        self.total_bytes += self._pixmap_bytes(pixmap)
+
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= self._pixmap_bytes(evicted)
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
 class Wallpaper(QLabel):
-    def __init__(self, wp_path, parent=None):
+    SMOOTH_SCALE_DELAY = 150
+
+    def __init__(self, wp_path, parent=None, pixmap=None, loader=None):
         super().__init__(parent)
 
         if not os.path.exists(wp_path):
             LOG_ERROR("Wallpaper not found in path: {}", wp_path)
             raise FileNotFoundError(f"Wallpaper not found: {wp_path}")
 
-        self.original_pixmap = QPixmap(wp_path)
-        if self.original_pixmap.isNull():
-            LOG_ERROR("QPixmap failed to load wallpaper image")
-            raise ValueError("Failed to load image with QPixmap")
+        self.wp_path = wp_path
+        self.cache = ScaledWallpaperCache()
+        #the smooth scale is decoded by the WallpaperLoader, never on the GUI thread
+        self.loader = loader
+        self.pending_size = None
+        self.target_size = (parent.width(), parent.height())
 
         self.setAlignment(Qt.AlignCenter)
         self.setScaledContents(False)
 
-        self.update_wallpaper(parent.width(), parent.height())
+        #resize bursts get a cheap scale right away and a single smooth scale at the end
+        self.smooth_timer = QTimer(self)
+        self.smooth_timer.setSingleShot(True)
+        self.smooth_timer.setInterval(self.SMOOTH_SCALE_DELAY)
+        self.smooth_timer.timeout.connect(self.apply_smooth_scale)
+        if loader is not None:
+            loader.rescaled.connect(self._on_rescaled)
+
+        if pixmap is not None:
+            #already decoded elsewhere (e.g. by WallpaperLoader): only rescale if the size changed since
+            self.setPixmap(pixmap)
+            self.update_wallpaper(parent.width(), parent.height())
+            return
+
+        if loader is None:
+            LOG_ERROR("Wallpaper needs a decoded pixmap or a loader: {}", wp_path)
+            raise ValueError("Wallpaper needs a decoded pixmap or a loader")
+        self.pending_size = self.target_size
+        self.apply_smooth_scale()
+
+    def _cache_key(self, width, height):
+        return self.cache.make_key(self.wp_path, width, height, self.devicePixelRatioF())
 
     def update_wallpaper(self, width, height):
-        if not self.original_pixmap.isNull():
-            scaled = self.original_pixmap.scaled(
-                width, height,
+        self.target_size = (width, height)
+        cached = self.cache.get(self._cache_key(width, height))
+        if cached is not None:
+            self.smooth_timer.stop()
+            self._show_pixmap(cached, width, height)
+            return
+
+        current = self.pixmap()
+        if current is not None and not current.isNull():
+            dpr = self.devicePixelRatioF()
+            fast = current.scaled(
+                int(width * dpr), int(height * dpr),
                 Qt.KeepAspectRatioByExpanding,
-                Qt.SmoothTransformation
+                Qt.FastTransformation
             )
-            self.setPixmap(scaled)
-            self.setGeometry(0, 0, width, height)
+            fast.setDevicePixelRatio(dpr)
+            self._show_pixmap(fast, width, height)
+
+        self.pending_size = (width, height)
+        self.smooth_timer.start()
+
+    def apply_smooth_scale(self):
+        if self.pending_size is None:
+            return False
+
+        width, height = self.pending_size
+        self.pending_size = None
+        if width <= 0 or height <= 0:
+            return True
+
+        scaled = self.cache.get(self._cache_key(width, height))
+        if scaled is not None:
+            self._show_pixmap(scaled, width, height)
+            return True
+        if self.loader is None:
+            return False
+
+        #the fast scale stays on screen until the loader delivers the smooth one (see _on_rescaled)
+        self.loader.rescale(self.wp_path, width, height, self.devicePixelRatioF())
+        return True
+
+    def _on_rescaled(self, wp_path, width, height, dpr):
+        if wp_path != self.wp_path or (width, height) != self.target_size:
+            return
+        scaled = self.cache.get(self._cache_key(width, height))
+        if scaled is not None:
+            self._show_pixmap(scaled, width, height)
+
+    def _show_pixmap(self, pixmap, width, height):
+        self.setPixmap(pixmap)
+        self.setGeometry(0, 0, width, height)
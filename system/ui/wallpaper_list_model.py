@@ -0,0 +1,113 @@
+import os
+from collections import OrderedDict
+from typing import List
+
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QPixmap, QColor
+
+from system.ui.image_decoder import IMAGE_EXTENSIONS
+
+class WallpaperListModel(QAbstractListModel):
+    """Lista de wallpapers que só guarda as miniaturas das linhas visíveis (ou próximas)."""
+    thumbnails_requested = Signal(list)
+
+    DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+
+    def __init__(self, directory, thumbnail_size, memory_budget=DEFAULT_MEMORY_BUDGET, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.memory_budget = memory_budget
+
+        self.paths: List[str] = []
+        self.rows = {}
+        self.pixmaps = OrderedDict()
+        self.pixmaps_bytes = 0
+        self.visible_range = (0, -1)
+
+        self.placeholder = QPixmap(thumbnail_size)
+        self.placeholder.fill(QColor("#2a2a2a"))
+
+    def load(self):
+        files = sorted(f for f in os.listdir(self.directory) if f.lower().endswith(IMAGE_EXTENSIONS))
+
+        self.beginResetModel()
+        self.paths = [os.path.join(self.directory, f) for f in files]
+        self.rows = {path: row for row, path in enumerate(self.paths)}
+        self.pixmaps.clear()
+        self.pixmaps_bytes = 0
+        self.visible_range = (0, -1)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.paths):
+            return None
+
+        path = self.paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(path)
+        if role == Qt.DecorationRole:
+            pixmap = self.pixmaps.get(path)
+            if pixmap is None:
+                return self.placeholder
+            self.pixmaps.move_to_end(path)
+            return pixmap
+        if role == Qt.ToolTipRole or role == Qt.UserRole:
+            return path
+        return None
+
+    def request_range(self, first, last):
+        """Pede as miniaturas das linhas [first, last] que ainda não estão em memória."""
+        if not self.paths:
+            return
+
+        first = max(0, first)
+        last = min(len(self.paths) - 1, last)
+        self.visible_range = (first, last)
+
+        missing = [path for path in self.paths[first:last + 1] if path not in self.pixmaps]
+        self.thumbnails_requested.emit(missing)
+
+    def set_thumbnails(self, batch):
+        for path, image in batch:
+            row = self.rows.get(path)
+            if row is None:
+                continue
+
+            old = self.pixmaps.pop(path, None)
+            if old is not None:
+                self.pixmaps_bytes -= self._pixmap_bytes(old)
+
+            pixmap = QPixmap.fromImage(image)
+            self.pixmaps[path] = pixmap
+            self.pixmaps_bytes += self._pixmap_bytes(pixmap)
+
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        if self.pixmaps_bytes <= self.memory_budget:
+            return
+
+        first, last = self.visible_range
+        for path in list(self.pixmaps.keys()):
+            if self.pixmaps_bytes <= self.memory_budget:
+                break
+            row = self.rows[path]
+            if first <= row <= last:
+                continue
+
+            pixmap = self.pixmaps.pop(path)
+            self.pixmaps_bytes -= self._pixmap_bytes(pixmap)
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
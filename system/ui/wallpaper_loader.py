@@ -0,0 +1,146 @@
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, QCoreApplication, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from system.core.log import *
+from system.ui.image_decoder import decode_scaled
+from system.ui.wallpaper import ScaledWallpaperCache
+
+class _DecodeSignals(QObject):
+    decoded = Signal(int, str, QImage, int, int, float)
+    failed = Signal(int, str)
+
+class _DecodeTask(QRunnable):
+    def __init__(self, loader, request_id, wp_path, width, height, dpr):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.wp_path = wp_path
+        self.width = width
+        self.height = height
+        self.dpr = dpr
+        self.signals = loader.decode_signals
+
+    def run(self):
+        if not self.loader.is_current(self.request_id):
+            return
+
+        image, stats = decode_scaled(self.wp_path, int(self.width * self.dpr), int(self.height * self.dpr),
+                                     Qt.KeepAspectRatioByExpanding)
+        LOG_TRACE("Wallpaper decode: {}", stats)
+
+        if not self.loader.is_current(self.request_id):
+            return
+
+        if image.isNull():
+            self.signals.failed.emit(self.request_id, self.wp_path)
+        else:
+            self.signals.decoded.emit(self.request_id, self.wp_path, image, self.width, self.height, self.dpr)
+
+class WallpaperLoader(QObject):
+    """Decodifica e redimensiona wallpapers fora da thread da GUI; só o último pedido é entregue."""
+    loaded = Signal(str, QPixmap)
+    failed = Signal(str)
+    prefetched = Signal(str, bool)
+    #a rescale finished and is in the cache: path, width, height, devicePixelRatio
+    rescaled = Signal(str, int, int, float)
+    
+    PREFETCH_REQUEST = -1
+    RESCALE_REQUEST = -2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = ScaledWallpaperCache()
+        self.current_request = 0
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        
+        #prefetches live in their own pool so a real request never cancels them
+        self.prefetch_pool = QThreadPool(self)
+        self.prefetch_pool.setMaxThreadCount(1)
+        
+        #smooth scales after a resize; only the last size asked for matters
+        self.rescale_pool = QThreadPool(self)
+        self.rescale_pool.setMaxThreadCount(1)
+
+        #queued to the GUI thread: QPixmap is only created there
+        self.decode_signals = _DecodeSignals(self)
+        self.decode_signals.decoded.connect(self._on_decoded)
+        self.decode_signals.failed.connect(self._on_failed)
+
+        #decodes still running at exit would emit into a half-destroyed window
+        QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    def is_current(self, request_id):
+        return request_id in (self.PREFETCH_REQUEST, self.RESCALE_REQUEST) or request_id == self.current_request
+
+    def request(self, wp_path, width, height, dpr):
+        self.current_request += 1
+        request_id = self.current_request
+
+        #superseded requests still waiting in the queue are dropped
+        self.pool.clear()
+
+        cached = self.cache.get(self.cache.make_key(wp_path, width, height, dpr))
+        if cached is not None:
+            self.loaded.emit(wp_path, cached)
+            return request_id
+
+        self.pool.start(_DecodeTask(self, request_id, wp_path, width, height, dpr))
+        return request_id
+
+    def prefetch(self, wp_path, width, height, dpr):
+        """Decodifica um wallpaper para o cache sem trocar o atual."""
+        if self.cache.get(self.cache.make_key(wp_path, width, height, dpr)) is not None:
+            self.prefetched.emit(wp_path, True)
+            return
+
+        self.prefetch_pool.start(_DecodeTask(self, self.PREFETCH_REQUEST, wp_path, width, height, dpr))
+
+    def rescale(self, wp_path, width, height, dpr):
+        """Gera em segundo plano a versão suavizada do wallpaper atual num novo tamanho; avisa por rescaled."""
+        if self.cache.get(self.cache.make_key(wp_path, width, height, dpr)) is not None:
+            self.rescaled.emit(wp_path, width, height, dpr)
+            return
+
+        self.rescale_pool.clear()
+        self.rescale_pool.start(_DecodeTask(self, self.RESCALE_REQUEST, wp_path, width, height, dpr))
+
+    def store(self, wp_path, image, width, height, dpr):
+        """Guarda no cache uma imagem decodificada em outra thread; precisa rodar na thread da GUI."""
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        self.cache.put(self.cache.make_key(wp_path, width, height, dpr), pixmap)
+        return pixmap
+
+    def _on_decoded(self, request_id, wp_path, image, width, height, dpr):
+        if not self.is_current(request_id):
+            return
+
+        pixmap = self.store(wp_path, image, width, height, dpr)
+
+        if request_id == self.PREFETCH_REQUEST:
+            self.prefetched.emit(wp_path, True)
+        elif request_id == self.RESCALE_REQUEST:
+            self.rescaled.emit(wp_path, width, height, dpr)
+        else:
+            self.loaded.emit(wp_path, pixmap)
+
+    def _on_failed(self, request_id, wp_path):
+        if request_id == self.PREFETCH_REQUEST:
+            LOG_WARN("Failed to prefetch wallpaper: {}", wp_path)
+            self.prefetched.emit(wp_path, False)
+        elif request_id == self.RESCALE_REQUEST:
+            LOG_WARN("Failed to rescale wallpaper: {}", wp_path)
+        elif self.is_current(request_id):
+            LOG_ERROR("Failed to decode wallpaper: {}", wp_path)
+            self.failed.emit(wp_path)
+
+    def shutdown(self):
+        self.current_request += 1
+        self.pool.clear()
+        self.prefetch_pool.clear()
+        self.rescale_pool.clear()
+        self.pool.waitForDone(2000)
+        self.prefetch_pool.waitForDone(2000)
+        self.rescale_pool.waitForDone(2000)
@@ -1,56 +1,143 @@
-from PySide6.QtWidgets import (QWidget, QListWidget, QVBoxLayout, QHBoxLayout, 
-                              QPushButton, QLabel, QListWidgetItem, QProgressBar)
-from PySide6.QtCore import Qt, Signal, QSize, QThread, QMutex, QWaitCondition
+from PySide6.QtWidgets import (QWidget, QListView, QVBoxLayout, QHBoxLayout, 
+                              QPushButton, QLabel, QProgressBar)
+from PySide6.QtCore import Qt, Signal, QSize, QThread, QMutex, QWaitCondition, QTimer, QEvent, QPoint
 from PySide6.QtGui import QPixmap, QIcon, QImage, QPainter
 import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from system.core.constants import *
+from system.core.log import *
+from system.ui.thumbnail_cache import ThumbnailCache
+from system.ui.image_decoder import decode_scaled
+from system.ui.wallpaper_list_model import WallpaperListModel
+
+THUMBNAIL_WIDTH = 200
+THUMBNAIL_HEIGHT = 150
 
 class ThumbnailGenerator(QThread):
     progress_updated = Signal(int, int)
-    thumbnail_generated = Signal(str, QPixmap) 
+    thumbnails_generated = Signal(list)
+    
+    BATCH_SIZE = 16
+    BATCH_INTERVAL = 0.1
 
-    def __init__(self, directory):
+    def __init__(self, directory, cache=None, reduced_decode=True, max_workers=None):
         super().__init__()
         self.directory = directory
+        self.cache = cache
+        self.reduced_decode = reduced_decode
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.mutex = QMutex()
         self.condition = QWaitCondition()
         self.restart = False
         self.abort = False
+        self.queue = deque()
+        self.requested = 0
+        self.completed = 0
+
+    def request(self, paths):
+        """Substitui a fila pelos caminhos pedidos; os já em andamento não são repetidos."""
+        self.mutex.lock()
+        self.queue = deque(paths)
+        self.condition.wakeAll()
+        self.mutex.unlock()
+
+    def is_aborted(self):
+        self.mutex.lock()
+        aborted = self.abort
+        self.mutex.unlock()
+        return aborted
+
+    def _load_thumbnail(self, full_path):
+        if self.is_aborted():
+            return None
+        
+        if self.cache:
+            thumbnail = self.cache.get(full_path, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+            if thumbnail is not None:
+                return thumbnail
+        
+        thumbnail, stats = decode_scaled(full_path, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT,
+                                         reduced=self.reduced_decode)
+        LOG_TRACE("Thumbnail decode: {}", stats)
+        if thumbnail.isNull():
+            return None
+        
+        if self.cache:
+            self.cache.put(full_path, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, thumbnail)
+        return thumbnail
+
+    def _take_requests(self, in_flight):
+        #called with the mutex held; keeps the pool busy without queueing stale rows
+        paths = []
+        busy = set(in_flight.values())
+        while self.queue and len(in_flight) + len(paths) < self.max_workers * 2:
+            path = self.queue.popleft()
+            if path not in busy:
+                paths.append(path)
+                busy.add(path)
+        self.requested += len(paths)
+        return paths
 
     def run(self):
-        files = [f for f in os.listdir(self.directory) 
-                if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-        total = len(files)
+        if self.cache:
+            self.cache.prune()
         
-        for idx, filename in enumerate(files):
-            self.mutex.lock()
-            if self.abort:
+        #QImage is safe to use outside the GUI thread, QPixmap is not: batches carry QImages
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="thumbnail")
+        in_flight = {}
+        batch = []
+        last_emit = time.perf_counter()
+        
+        try:
+            while True:
+                self.mutex.lock()
+                if self.abort:
+                    self.mutex.unlock()
+                    break
+                if not in_flight and not self.queue:
+                    if batch:
+                        self.mutex.unlock()
+                        self._emit_batch(batch)
+                        batch = []
+                        continue
+                    if self.cache:
+                        self.cache.flush()
+                    self.condition.wait(self.mutex)
+                    if self.abort:
+                        self.mutex.unlock()
+                        break
+                paths = self._take_requests(in_flight)
                 self.mutex.unlock()
-                return
-            self.mutex.unlock()
-            
-            full_path = os.path.join(self.directory, filename)
-            
-            img = QImage(full_path)
-            if img.isNull():
-                continue
                 
-            thumbnail = img.scaled(200, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            
-            pixmap = QPixmap.fromImage(thumbnail)
-            
-            self.thumbnail_generated.emit(full_path, pixmap)
-            self.progress_updated.emit(idx + 1, total)
-            
-            time.sleep(0.02)
-            
-            self.mutex.lock()
-            if self.restart:
-                self.restart = False
-                self.mutex.unlock()
-                break
-            self.mutex.unlock()
+                for path in paths:
+                    in_flight[executor.submit(self._load_thumbnail, path)] = path
+                if not in_flight:
+                    continue
+                
+                done, _ = wait(in_flight, timeout=self.BATCH_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = in_flight.pop(future)
+                    self.completed += 1
+                    thumbnail = future.result()
+                    if thumbnail is not None:
+                        batch.append((path, thumbnail))
+                
+                now = time.perf_counter()
+                if len(batch) >= self.BATCH_SIZE or (batch and now - last_emit >= self.BATCH_INTERVAL):
+                    self._emit_batch(batch)
+                    batch = []
+                    last_emit = now
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.cache:
+                self.cache.flush()
+
+    def _emit_batch(self, batch):
+        if batch:
+            self.thumbnails_generated.emit(batch)
+        self.progress_updated.emit(self.completed, self.requested)
 
     def stop(self):
         self.mutex.lock()
@@ -75,12 +162,17 @@ class WallpaperSelector(QWidget):
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
         
-        self.wallpaper_list = QListWidget()
-        self.wallpaper_list.setIconSize(QSize(200, 150))
-        self.wallpaper_list.setViewMode(QListWidget.IconMode)
-        self.wallpaper_list.setResizeMode(QListWidget.Adjust)
+        self.wallpaper_model = WallpaperListModel(WALLPAPERS_PATH, QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT), parent=self)
+        
+        self.wallpaper_list = QListView()
+        self.wallpaper_list.setModel(self.wallpaper_model)
+        self.wallpaper_list.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        self.wallpaper_list.setViewMode(QListView.IconMode)
+        self.wallpaper_list.setResizeMode(QListView.Adjust)
+        self.wallpaper_list.setMovement(QListView.Static)
+        self.wallpaper_list.setUniformItemSizes(True)
         self.wallpaper_list.setSpacing(10)
-        self.wallpaper_list.setVerticalScrollMode(QListWidget.ScrollPerPixel)
+        self.wallpaper_list.setVerticalScrollMode(QListView.ScrollPerPixel)
         layout.addWidget(self.wallpaper_list)
         
         button_layout = QHBoxLayout()
@@ -97,21 +189,30 @@ class WallpaperSelector(QWidget):
         
         layout.addLayout(button_layout)
         
-        self.thumbnail_thread = ThumbnailGenerator(WALLPAPERS_PATH)
-        self.thumbnail_thread.thumbnail_generated.connect(self.add_thumbnail_item)
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_thread = ThumbnailGenerator(WALLPAPERS_PATH, self.thumbnail_cache)
+        self.thumbnail_thread.thumbnails_generated.connect(self.wallpaper_model.set_thumbnails)
         self.thumbnail_thread.progress_updated.connect(self.update_progress)
-        self.thumbnail_thread.finished.connect(self.loading_finished)
+        self.wallpaper_model.thumbnails_requested.connect(self.thumbnail_thread.request)
+        
+        #coalesces scroll/resize bursts into a single viewport request
+        self.viewport_timer = QTimer(self)
+        self.viewport_timer.setSingleShot(True)
+        self.viewport_timer.setInterval(50)
+        self.viewport_timer.timeout.connect(self.request_visible_thumbnails)
+        self.wallpaper_list.verticalScrollBar().valueChanged.connect(lambda _: self.viewport_timer.start())
+        self.wallpaper_list.viewport().installEventFilter(self)
         
         self.start_loading()
         
         self.setStyleSheet("""
-            QListWidget::item {
+            QListView::item {
                 border: 1px solid #444;
                 border-radius: 4px;
                 padding: 5px;
                 background-color: #2a2a2a;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #2a82da;
                 border: 2px solid #1a62ba;
             }
@@ -128,36 +229,56 @@ class WallpaperSelector(QWidget):
         """)
     
     def start_loading(self):
-        self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.wallpaper_list.clear()
-        self.select_button.setEnabled(False)
+        self.wallpaper_model.load()
+        self.select_button.setEnabled(self.wallpaper_model.rowCount() > 0)
+        
+        if self.wallpaper_model.rowCount() > 0:
+            self.wallpaper_list.setCurrentIndex(self.wallpaper_model.index(0))
+        
         self.thumbnail_thread.start()
+        self.viewport_timer.start()
+    
+    def eventFilter(self, obj, event):
+        if obj is self.wallpaper_list.viewport() and event.type() in (QEvent.Resize, QEvent.Show):
+            self.viewport_timer.start()
+        return super().eventFilter(obj, event)
+    
+    def request_visible_thumbnails(self):
+        rows = self.wallpaper_model.rowCount()
+        if rows == 0:
+            return
+        
+        #icon mode leaves gaps between items, so sample the viewport on a grid finer than an item
+        viewport_rect = self.wallpaper_list.viewport().rect()
+        visible_rows = set()
+        for x in range(0, viewport_rect.width(), THUMBNAIL_WIDTH // 2):
+            for y in range(0, viewport_rect.height(), THUMBNAIL_HEIGHT // 2):
+                index = self.wallpaper_list.indexAt(QPoint(x, y))
+                if index.isValid():
+                    visible_rows.add(index.row())
+        
+        if not visible_rows:
+            return
+        
+        first = min(visible_rows)
+        last = max(visible_rows)
+        
+        #prefetch one screen ahead and behind
+        margin = last - first + 1
+        self.wallpaper_model.request_range(first - margin, last + margin)
     
     def update_progress(self, current, total):
+        pending = total - current
+        self.progress_bar.setVisible(pending > 0)
         percent = int((current / total) * 100) if total > 0 else 0
         self.progress_bar.setValue(percent)
         self.progress_bar.setFormat(f"Carregando: {percent}% ({current}/{total})")
     
-    def add_thumbnail_item(self, file_path, pixmap):
-        filename = os.path.basename(file_path)
-        icon = QIcon(pixmap)
-        
-        item = QListWidgetItem(icon, filename)
-        item.setData(Qt.UserRole, file_path)
-        self.wallpaper_list.addItem(item)
-    
-    def loading_finished(self):
-        self.progress_bar.setVisible(False)
-        self.select_button.setEnabled(True)
-        
-        if self.wallpaper_list.count() > 0:
-            self.wallpaper_list.setCurrentRow(0)
-    
     def select_wallpaper(self):
-        selected_items = self.wallpaper_list.selectedItems()
-        if selected_items:
-            wallpaper_path = selected_items[0].data(Qt.UserRole)
+        selected_indexes = self.wallpaper_list.selectionModel().selectedIndexes()
+        if selected_indexes:
+            wallpaper_path = selected_indexes[0].data(Qt.UserRole)
             self.wallpaper_selected.emit(wallpaper_path)
             self.close()
     